@@ -5,5 +5,5 @@ This module contains functions and classes for interacting with the Collibra API
 """
 
 from .oauth_auth import get_auth_header, get_oauth_token
-from .graphql_query import get_query, get_nested_query
-from .fetcher import make_request, fetch_data, fetch_nested_data
+from .graphql_query import get_query, get_nested_query, get_nested_query_template, get_nested_pages_query, get_nested_bulk_query
+from .fetcher import make_request, fetch_data, fetch_nested_data, fetch_nested_data_bulk
@@ -4,19 +4,110 @@ Data Fetcher Module
 This module provides functionality for fetching data from the Collibra API.
 """
 
+import os
+import sys
 import json
 import time
 import logging
-from typing import List, Dict, Any
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import List, Dict, Any, Union
 import requests
-from .oauth_auth import get_auth_header
-from . import get_query, get_nested_query
+from .oauth_auth import get_auth_header, invalidate_oauth_token
+from .graphql_query import get_query, get_nested_query, get_nested_pages_query, get_nested_bulk_query
 from ..utils.performance_monitor import start_timer, stop_timer, increment_counter
-from ..utils.cache_manager import cached, cache_manager
-from ..utils.http_optimizer import make_optimized_request, HTTPOptimizer, BatchRequest, batch_http_requests
+from ..utils.cache_manager import cache_manager, make_cache_key
+from ..utils.json_codec import json_loads, intern_values
+from ..utils.http_optimizer import make_optimized_request, get_optimized_session, BatchRequest, batch_http_requests
 
 logger = logging.getLogger(__name__)
 
+# (connect, read) timeouts for Collibra requests. The read timeout has to cover the
+# slowest GraphQL documents: 20000-item nested pages and aliased multi-page or bulk queries
+GRAPHQL_TIMEOUT = (
+    float(os.getenv('COLLIBRA_CONNECT_TIMEOUT', '5')),
+    float(os.getenv('COLLIBRA_READ_TIMEOUT', '300'))
+)
+
+# Maximum number of nested pages requested in a single aliased GraphQL document
+MAX_PAGES_PER_QUERY = 5
+
+# Pages requested in the first aliased document; doubled on each round-trip up to the maximum
+INITIAL_PAGES_PER_QUERY = 1
+
+@dataclass(frozen=True)
+class NestedRequest:
+    """A single nested field to fetch as part of a batch."""
+    asset_type_id: str
+    asset_id: str
+    field_name: str
+    nested_limit: int = 20000
+
+# Futures for fetches currently in progress, keyed by cache key
+_INFLIGHT: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+def _single_flight(key, fetch):
+    """
+    Run fetch() once for all callers concurrently requesting the same key.
+    
+    The first caller performs the fetch; callers arriving while it is in
+    progress wait for and share its result instead of issuing a duplicate request.
+    
+    Args:
+        key: Cache key identifying the request
+        fetch: Callable performing the request
+        
+    Returns:
+        The result of fetch()
+    """
+    with _inflight_lock:
+        future = _INFLIGHT.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _INFLIGHT[key] = future
+    
+    if not is_owner:
+        increment_counter("inflight_requests_deduplicated")
+        return future.result()
+    
+    try:
+        result = fetch()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _INFLIGHT.pop(key, None)
+
+def _persist(cache_key, value):
+    """
+    Store a fetched value in the persistent cache, if it is enabled.
+    
+    Args:
+        cache_key: Cache key shared with the in-memory cache
+        value: The value to store
+    """
+    persistent_cache = cache_manager.get_persistent_cache()
+    if persistent_cache is not None:
+        persistent_cache.put(cache_key, value)
+
+def get_session(base_url):
+    """
+    Get the pooled HTTP session shared by all requests to a Collibra instance.
+    
+    Args:
+        base_url: The base URL of the Collibra instance (without scheme)
+        
+    Returns:
+        requests.Session: The shared session with keep-alive connection pooling
+    """
+    return get_optimized_session(f"https://{base_url}")
+
 def make_request(url, method='post', **kwargs):
     """
     Make a request with automatic token refresh handling and optimized connection management.
@@ -40,6 +131,10 @@ def make_request(url, method='post', **kwargs):
             kwargs['headers'].update(headers)
         else:
             kwargs['headers'] = headers
+        
+        # Passed explicitly, so GraphQL calls do not get the optimizer's short default
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = GRAPHQL_TIMEOUT
 
         # Use the optimized HTTP request system
         response = make_optimized_request(url=url, method=method, **kwargs)
@@ -53,7 +148,53 @@ def make_request(url, method='post', **kwargs):
     finally:
         stop_timer(timer_id)
 
-def fetch_data(base_url, asset_type_id, paginate, limit, nested_offset=0, nested_limit=50):
+def _post_graphql(base_url, query):
+    """
+    Send a GraphQL query and decode the response.
+    
+    The response, and with it the raw body bytes, is released as soon as it
+    has been decoded rather than living on alongside the parsed data.
+    
+    Args:
+        base_url: The base URL of the Collibra instance
+        query: The GraphQL query string
+        
+    Returns:
+        dict: The decoded response document
+    """
+    response = make_request(
+        url=f"https://{base_url}/graphql/knowledgeGraph/v1",
+        json={'query': query}
+    )
+    try:
+        return json_loads(response.content)
+    finally:
+        response.close()
+
+def _extract_nested_items(data, field_name, alias='assets'):
+    """
+    Extract the items of a nested field from a decoded nested query response.
+    
+    Args:
+        data: The decoded response document
+        field_name: Name of the nested field
+        alias: Name under which the asset was selected (default: 'assets')
+        
+    Returns:
+        list: The nested items, or None if the response has errors or no asset
+    """
+    if 'errors' in data:
+        logger.error(f"GraphQL errors in nested query: {data['errors']}")
+        return None
+    
+    assets = data['data'][alias]
+    if not assets:
+        logger.error(f"No asset found in nested query response")
+        return None
+    
+    return intern_values(assets[0][field_name])
+
+def fetch_data(base_url, asset_type_id, paginate, limit, nested_offset=0, nested_limit=50, field_limits=None):
     """
     Fetch initial data batch with basic nested limits and intelligent caching.
     
@@ -64,12 +205,17 @@ def fetch_data(base_url, asset_type_id, paginate, limit, nested_offset=0, nested
         limit: Maximum number of assets to fetch
         nested_offset: Offset for nested fields
         nested_limit: Limit for nested fields
+        field_limits: Optional mapping of nested field name to a limit overriding nested_limit
         
     Returns:
         dict: The response data, or None if the request fails
     """
-    # Create cache key for this specific request
-    cache_key = f"graphql_data:{asset_type_id}:{paginate}:{limit}:{nested_offset}:{nested_limit}"
+    # Create cache key for this specific request; requests without per-field
+    # limits keep the keys they had before per-field limits existed
+    key_parts = (asset_type_id, paginate, limit, nested_offset, nested_limit)
+    if field_limits:
+        key_parts += (sorted(field_limits.items()),)
+    cache_key = make_cache_key('graphql_data', *key_parts)
     
     # Try to get from cache first (shorter TTL for paginated data)
     cache = cache_manager.get_graphql_cache()
@@ -80,19 +226,47 @@ def fetch_data(base_url, asset_type_id, paginate, limit, nested_offset=0, nested
         increment_counter("graphql_cache_hits")
         return cached_result
     
+    # Fall back to the persistent cache kept from previous runs
+    persistent_cache = cache_manager.get_persistent_cache()
+    if persistent_cache is not None:
+        persisted_result = persistent_cache.get(cache_key)
+        if persisted_result is not None:
+            logger.debug(f"Persistent cache hit for GraphQL request: {asset_type_id}")
+            cache.put(cache_key, persisted_result, 60 if paginate else 300)
+            return persisted_result
+    
     logger.debug(f"Cache miss for GraphQL request: {asset_type_id}")
     increment_counter("graphql_cache_misses")
     
+    # Concurrent callers asking for the same page share a single request
+    return _single_flight(cache_key, lambda: _fetch_data_from_api(
+        base_url, asset_type_id, paginate, limit, nested_offset, nested_limit, cache, cache_key, field_limits
+    ))
+
+def _fetch_data_from_api(base_url, asset_type_id, paginate, limit, nested_offset, nested_limit, cache, cache_key,
+                         field_limits=None):
+    """
+    Fetch a batch of assets from the GraphQL API and cache the response.
+    
+    Returns:
+        dict: The response data, or None if the request fails
+    """
     try:
-        query = get_query(asset_type_id, f'"{paginate}"' if paginate else 'null', nested_offset, nested_limit)
+        query = get_query(asset_type_id, f'"{paginate}"' if paginate else 'null', nested_offset, nested_limit, field_limits)
         variables = {'limit': limit}
         logger.debug(f"Sending GraphQL request for asset_type_id: {asset_type_id}, paginate: {paginate}, nested_offset: {nested_offset}")
 
         graphql_url = f"https://{base_url}/graphql/knowledgeGraph/v1"
         start_time = time.time()
         
+        # Revalidate an expired response instead of downloading it again
+        etag_cache = cache_manager.get_etag_cache()
+        validated = etag_cache.get(cache_key)
+        headers = {'If-None-Match': validated['etag']} if validated else {}
+        
         response = make_request(
             url=graphql_url,
+            headers=headers,
             json={
                 'query': query,
                 'variables': variables
@@ -102,18 +276,33 @@ def fetch_data(base_url, asset_type_id, paginate, limit, nested_offset=0, nested
         response_time = time.time() - start_time
         logger.debug(f"GraphQL request completed in {response_time:.2f} seconds")
 
-        data = response.json()
+        # Use shorter TTL for paginated requests (they change more frequently)
+        ttl = 60 if paginate else 300  # 1 minute for paginated, 5 minutes for first page
+        
+        if response.status_code == 304 and validated:
+            logger.debug(f"GraphQL response not modified for asset_type_id: {asset_type_id}")
+            increment_counter("graphql_responses_not_modified")
+            data = validated['data']
+            cache.put(cache_key, data, ttl)
+            etag_cache.put(cache_key, validated)
+            return data
+
+        data = json_loads(response.content)
         
         if 'errors' in data:
             logger.error(f"GraphQL errors received: {data['errors']}")
             return None
         
         # Cache the successful response with appropriate TTL
-        # Use shorter TTL for paginated requests (they change more frequently)
-        ttl = 60 if paginate else 300  # 1 minute for paginated, 5 minutes for first page
         cache.put(cache_key, data, ttl)
         increment_counter("graphql_responses_cached")
         
+        etag = response.headers.get('ETag')
+        if etag:
+            etag_cache.put(cache_key, {'etag': etag, 'data': data})
+        
+        _persist(cache_key, data)
+        
         return data
     except requests.RequestException as error:
         logger.exception(f"Request failed for asset_type_id {asset_type_id}: {str(error)}")
@@ -137,7 +326,7 @@ def fetch_nested_data(base_url, asset_type_id, asset_id, field_name, nested_limi
         list: List of all nested items for the field or None if an error occurs
     """
     # Create cache key for nested data
-    cache_key = f"nested_data:{asset_type_id}:{asset_id}:{field_name}:{nested_limit}"
+    cache_key = make_cache_key('nested_data', asset_type_id, asset_id, field_name, nested_limit)
     
     # Try to get from cache first
     cache = cache_manager.get_nested_data_cache()
@@ -148,128 +337,314 @@ def fetch_nested_data(base_url, asset_type_id, asset_id, field_name, nested_limi
         increment_counter("nested_data_cache_hits")
         return cached_result
     
+    # Fall back to the persistent cache kept from previous runs
+    persistent_cache = cache_manager.get_persistent_cache()
+    if persistent_cache is not None:
+        persisted_result = persistent_cache.get(cache_key)
+        if persisted_result is not None:
+            logger.debug(f"Persistent cache hit for nested data: {asset_id}:{field_name}")
+            cache.put(cache_key, persisted_result, ttl=600)
+            return persisted_result
+    
     logger.debug(f"Cache miss for nested data: {asset_id}:{field_name}")
     increment_counter("nested_data_cache_misses")
     
+    # Concurrent callers asking for the same field share a single fetch
+    return _single_flight(cache_key, lambda: _fetch_nested_data_from_api(
+        base_url, asset_type_id, asset_id, field_name, nested_limit, cache, cache_key
+    ))
+
+def _fetch_nested_data_from_api(base_url, asset_type_id, asset_id, field_name, nested_limit, cache, cache_key):
+    """
+    Fetch all items of a nested field from the GraphQL API and cache the result.
+    
+    Returns:
+        list: List of all nested items for the field or None if an error occurs
+    """
     try:
         # First attempt with maximum limit to see if pagination is needed
         query = get_nested_query(asset_type_id, asset_id, field_name, 0, nested_limit)
         
-        graphql_url = f"https://{base_url}/graphql/knowledgeGraph/v1"
         start_time = time.time()
         
-        response = make_request(
-            url=graphql_url,
-            json={'query': query}
-        )
+        data = _post_graphql(base_url, query)
         
         response_time = time.time() - start_time
         logger.debug(f"Nested GraphQL request completed in {response_time:.2f} seconds")
 
-        data = response.json()
-        if 'errors' in data:
-            logger.error(f"GraphQL errors in nested query: {data['errors']}")
-            return None
-            
-        if not data['data']['assets']:
-            logger.error(f"No asset found in nested query response")
+        initial_results = _extract_nested_items(data, field_name)
+        # Drop the envelope so only the items stay alive while paginating
+        del data
+        if initial_results is None:
             return None
-            
-        initial_results = data['data']['assets'][0][field_name]
         
         # If we hit the limit, use pagination to fetch all results
         if len(initial_results) == nested_limit:
             logger.info(f"Hit nested limit of {nested_limit} for {field_name}, switching to pagination")
-            
-            # Use pagination to fetch all items
-            all_items = []
-            offset = 0
-            batch_number = 1
-            batch_size = nested_limit
-
-            # Add initial results to our collection
-            all_items.extend(initial_results)
-            offset += nested_limit
-            
-            # Continue fetching batches until we get fewer items than requested
-            while True:
-                logger.info(f"Fetching batch {batch_number} for {field_name} (offset: {offset})")
-                
-                # Check cache for individual batch
-                batch_cache_key = f"nested_batch:{asset_type_id}:{asset_id}:{field_name}:{offset}:{batch_size}"
-                cached_batch = cache.get(batch_cache_key)
-                
-                if cached_batch is not None:
-                    logger.debug(f"Cache hit for nested batch: {asset_id}:{field_name}:{offset}")
-                    current_items = cached_batch
-                    increment_counter("nested_batch_cache_hits")
-                else:
-                    logger.debug(f"Cache miss for nested batch: {asset_id}:{field_name}:{offset}")
-                    increment_counter("nested_batch_cache_misses")
-                    
-                    query = get_nested_query(asset_type_id, asset_id, field_name, offset, batch_size)
-                    
-                    try:
-                        response = make_request(
-                            url=f"https://{base_url}/graphql/knowledgeGraph/v1",
-                            json={'query': query}
-                        )
-                        
-                        data = response.json()
-                        
-                        if 'errors' in data:
-                            logger.error(f"GraphQL errors in nested query: {data['errors']}")
-                            break
-                            
-                        if not data['data']['assets']:
-                            logger.error(f"No asset found in nested query response")
-                            break
-                            
-                        current_items = data['data']['assets'][0][field_name]
-                        
-                        # Cache the batch result
-                        cache.put(batch_cache_key, current_items, ttl=600)  # 10 minutes TTL
-                        increment_counter("nested_batches_cached")
-                        
-                    except Exception as e:
-                        logger.exception(f"Failed to fetch batch {batch_number} for {field_name}: {str(e)}")
-                        break
-                
-                current_batch_size = len(current_items)
-                all_items.extend(current_items)
-                logger.info(f"Retrieved {current_batch_size} items in batch {batch_number}")
-                
-                # If we got fewer items than the batch size, we've reached the end
-                if current_batch_size < batch_size:
-                    break
-                    
-                offset += batch_size
-                batch_number += 1
-
+            all_items = _fetch_remaining_nested_pages(base_url, asset_type_id, asset_id, field_name,
+                                                      initial_results, nested_limit, cache)
             logger.info(f"Completed fetching {field_name}. Total items: {len(all_items)}")
             
             # Cache the complete result
             cache.put(cache_key, all_items, ttl=600)  # 10 minutes TTL
             increment_counter("nested_data_complete_cached")
+            _persist(cache_key, all_items)
             
             return all_items
             
         # If we didn't hit the limit, cache and return the initial results
         cache.put(cache_key, initial_results, ttl=600)  # 10 minutes TTL
         increment_counter("nested_data_simple_cached")
+        _persist(cache_key, initial_results)
         
         return initial_results
     except Exception as e:
         logger.exception(f"Failed to fetch nested data for {field_name}: {str(e)}")
         return None
 
-def fetch_nested_data_batch(base_url, requests_data: List[Dict[str, Any]], max_concurrent: int = 5) -> Dict[str, Any]:
+def _fetch_remaining_nested_pages(base_url, asset_type_id, asset_id, field_name, first_page, batch_size, cache):
+    """
+    Page through a nested field whose first page came back full.
+    
+    Args:
+        base_url: The base URL of the Collibra instance
+        asset_type_id: ID of the asset type
+        asset_id: ID of the specific asset
+        field_name: Name of the nested field to fetch
+        first_page: Items already received for offset 0
+        batch_size: Number of nested items per page (the size of the first page)
+        cache: Cache used for individual pages
+        
+    Returns:
+        list: The first page followed by all remaining items
+    """
+    all_items = list(first_page)
+    offset = batch_size
+    batch_number = 1
+    
+    # Fetch several pages per round-trip until we get fewer items than requested.
+    # Most overflowing fields only spill into one more page, so start with a
+    # single page and grow the document only while pages keep coming back full.
+    pages_per_query = INITIAL_PAGES_PER_QUERY
+    while True:
+        offsets = [offset + page * batch_size for page in range(pages_per_query)]
+        logger.info(f"Fetching batches {batch_number}-{batch_number + len(offsets) - 1} "
+                    f"for {field_name} (offset: {offset})")
+        
+        pages = _fetch_nested_pages(base_url, asset_type_id, asset_id, field_name,
+                                    offsets, batch_size, cache)
+        
+        reached_end = len(pages) < len(offsets)
+        for current_items in pages:
+            current_batch_size = len(current_items)
+            all_items.extend(current_items)
+            logger.info(f"Retrieved {current_batch_size} items in batch {batch_number}")
+            batch_number += 1
+            
+            # If we got fewer items than the batch size, we've reached the end
+            if current_batch_size < batch_size:
+                reached_end = True
+                break
+        
+        if reached_end:
+            break
+            
+        offset += len(offsets) * batch_size
+        pages_per_query = min(pages_per_query * 2, MAX_PAGES_PER_QUERY)
+    
+    return all_items
+
+def fetch_nested_data_bulk(base_url, asset_type_id, requests_list, nested_limit=20000):
+    """
+    Fetch nested fields of several assets of one asset type in a single aliased GraphQL request.
+    
+    Cached fields are served from the cache. A field that comes back with
+    nested_limit items is paged through from the items already received;
+    every field is fetched on its own with fetch_nested_data when the
+    aliased request fails.
+    
+    Args:
+        base_url: The base URL of the Collibra instance
+        asset_type_id: ID of the asset type
+        requests_list: List of (asset_id, field_name) pairs
+        nested_limit: Limit for number of nested items per field
+        
+    Returns:
+        dict: Items keyed by (asset_id, field_name); None where the fetch failed
+    """
+    cache = cache_manager.get_nested_data_cache()
+    persistent_cache = cache_manager.get_persistent_cache()
+    results = {}
+    cache_keys = {}
+    pending = {}
+    
+    for asset_id, field_name in requests_list:
+        cache_key = make_cache_key('nested_data', asset_type_id, asset_id, field_name, nested_limit)
+        cached_result = cache.get(cache_key)
+        if cached_result is None and persistent_cache is not None:
+            cached_result = persistent_cache.get(cache_key)
+            if cached_result is not None:
+                cache.put(cache_key, cached_result, ttl=600)
+        
+        if cached_result is not None:
+            increment_counter("nested_data_cache_hits")
+            results[(asset_id, field_name)] = cached_result
+            continue
+        
+        increment_counter("nested_data_cache_misses")
+        cache_keys[(asset_id, field_name)] = cache_key
+        pending.setdefault(asset_id, []).append(field_name)
+    
+    if not pending:
+        return results
+    
+    asset_fields = list(pending.items())
+    data = None
+    try:
+        data = _post_graphql(base_url, get_nested_bulk_query(asset_type_id, asset_fields, nested_limit))
+        if 'errors' in data:
+            logger.warning(f"GraphQL errors in bulk nested query: {data['errors']}")
+            data = None
+    except Exception as e:
+        logger.warning(f"Bulk nested query for {len(cache_keys)} fields failed: {str(e)}")
+    
+    if data is None:
+        # The server may reject large aliased documents, so fall back to one field per request
+        increment_counter("nested_data_bulk_fallbacks")
+    
+    for asset_index, (asset_id, field_names) in enumerate(asset_fields):
+        assets = data['data'].get(f"asset{asset_index}") if data is not None else None
+        for field_name in field_names:
+            key = (asset_id, field_name)
+            items = assets[0].get(field_name) if assets else None
+            
+            if items is None:
+                results[key] = fetch_nested_data(base_url, asset_type_id, asset_id, field_name, nested_limit)
+                continue
+            
+            items = intern_values(items)
+            if len(items) == nested_limit:
+                # The first page is already here, so continue paging from it
+                logger.info(f"Hit nested limit of {nested_limit} for {field_name}, switching to pagination")
+                try:
+                    items = _fetch_remaining_nested_pages(base_url, asset_type_id, asset_id, field_name,
+                                                          items, nested_limit, cache)
+                except Exception as e:
+                    logger.exception(f"Failed to fetch nested data for {field_name}: {str(e)}")
+                    results[key] = None
+                    continue
+            cache.put(cache_keys[key], items, ttl=600)  # 10 minutes TTL
+            increment_counter("nested_data_bulk_cached")
+            _persist(cache_keys[key], items)
+            results[key] = items
+    
+    return results
+
+def _fetch_nested_pages(base_url, asset_type_id, asset_id, field_name, offsets, batch_size, cache):
+    """
+    Fetch several pages of a nested field, batching uncached pages into one aliased query.
+    
+    Args:
+        base_url: The base URL of the Collibra instance
+        asset_type_id: ID of the asset type
+        asset_id: ID of the specific asset
+        field_name: Name of the nested field to fetch
+        offsets: Offsets of the pages to fetch, in ascending order
+        batch_size: Number of nested items per page
+        cache: Cache used for individual pages
+        
+    Returns:
+        list: Item lists for the leading pages that were fetched successfully, in offset order
+    """
+    pages = {}
+    missing_offsets = []
+    for offset in offsets:
+        batch_cache_key = make_cache_key('nested_batch', asset_type_id, asset_id, field_name, offset, batch_size)
+        cached_batch = cache.get(batch_cache_key)
+        
+        if cached_batch is not None:
+            logger.debug(f"Cache hit for nested batch: {asset_id}:{field_name}:{offset}")
+            increment_counter("nested_batch_cache_hits")
+            pages[offset] = cached_batch
+        else:
+            logger.debug(f"Cache miss for nested batch: {asset_id}:{field_name}:{offset}")
+            increment_counter("nested_batch_cache_misses")
+            missing_offsets.append(offset)
+    
+    if missing_offsets:
+        fetched = _fetch_aliased_nested_pages(base_url, asset_type_id, asset_id, field_name,
+                                              missing_offsets, batch_size)
+        if fetched is None:
+            # The server may reject aliased documents (e.g. query complexity limits),
+            # so fall back to one page per request
+            logger.warning(f"Aliased page query failed for {field_name}, falling back to single-page requests")
+            increment_counter("nested_batch_alias_fallbacks")
+            fetched = {}
+            for offset in missing_offsets:
+                items = _fetch_aliased_nested_pages(base_url, asset_type_id, asset_id, field_name,
+                                                    [offset], batch_size)
+                if items is None:
+                    break
+                fetched.update(items)
+                if len(items[offset]) < batch_size:
+                    break
+        
+        for offset, items in fetched.items():
+            batch_cache_key = make_cache_key('nested_batch', asset_type_id, asset_id, field_name, offset, batch_size)
+            cache.put(batch_cache_key, items, ttl=600)  # 10 minutes TTL
+            increment_counter("nested_batches_cached")
+        pages.update(fetched)
+    
+    # Only return the contiguous run of pages starting at the first offset
+    ordered_pages = []
+    for offset in offsets:
+        if offset not in pages:
+            break
+        ordered_pages.append(pages[offset])
+    return ordered_pages
+
+def _fetch_aliased_nested_pages(base_url, asset_type_id, asset_id, field_name, offsets, batch_size):
+    """
+    Fetch the given pages of a nested field in a single aliased GraphQL request.
+    
+    Returns:
+        dict: Mapping of offset to the list of items, or None if the request fails
+    """
+    if len(offsets) == 1:
+        query = get_nested_query(asset_type_id, asset_id, field_name, offsets[0], batch_size)
+        aliases = ['assets']
+    else:
+        query = get_nested_pages_query(asset_type_id, asset_id, field_name, offsets, batch_size)
+        aliases = [f"page{page}" for page in range(len(offsets))]
+    
+    try:
+        data = _post_graphql(base_url, query)
+        
+        pages = {}
+        for offset, alias in zip(offsets, aliases):
+            items = _extract_nested_items(data, field_name, alias)
+            if items is None:
+                return None
+            pages[offset] = items
+        return pages
+        
+    except Exception as e:
+        logger.exception(f"Failed to fetch batches at offsets {offsets} for {field_name}: {str(e)}")
+        return None
+
+def _is_unauthorized(error):
+    """Check whether a failed request was rejected with HTTP 401."""
+    response = getattr(error, 'response', None)
+    return response is not None and response.status_code == 401
+
+def fetch_nested_data_batch(base_url, requests_data: List[Union[NestedRequest, Dict[str, Any]]],
+                            max_concurrent: int = 10) -> Dict[str, Any]:
     """
     Fetch multiple nested data requests concurrently for optimal performance.
     
     Args:
         base_url: The base URL of the Collibra instance
-        requests_data: List of request data dictionaries containing:
+        requests_data: List of NestedRequest objects, or dictionaries containing:
             - asset_type_id: ID of the asset type
             - asset_id: ID of the specific asset
             - field_name: Name of the nested field to fetch
@@ -288,19 +663,24 @@ def fetch_nested_data_batch(base_url, requests_data: List[Dict[str, Any]], max_c
     # Prepare batch requests
     batch_requests = []
     request_mapping = {}
+    request_cache_keys = {}
+    cache = cache_manager.get_nested_data_cache()
+    auth_header = None
     
-    for i, req_data in enumerate(requests_data):
-        asset_type_id = req_data['asset_type_id']
-        asset_id = req_data['asset_id']
-        field_name = req_data['field_name']
-        nested_limit = req_data.get('nested_limit', 20000)
+    for req_data in requests_data:
+        if not isinstance(req_data, NestedRequest):
+            req_data = NestedRequest(**req_data)
+        asset_type_id = req_data.asset_type_id
+        asset_id = req_data.asset_id
+        field_name = req_data.field_name
+        nested_limit = req_data.nested_limit
         
         # Create cache key for this request
-        cache_key = f"nested_data:{asset_type_id}:{asset_id}:{field_name}:{nested_limit}"
+        cache_key = make_cache_key('nested_data', asset_type_id, asset_id, field_name, nested_limit)
         request_key = f"{asset_id}:{field_name}"
+        request_cache_keys[request_key] = cache_key
         
         # Check cache first
-        cache = cache_manager.get_nested_data_cache()
         cached_result = cache.get(cache_key)
         
         if cached_result is not None:
@@ -316,11 +696,17 @@ def fetch_nested_data_batch(base_url, requests_data: List[Dict[str, Any]], max_c
         # Create GraphQL query
         query = get_nested_query(asset_type_id, asset_id, field_name, 0, nested_limit)
         
+        # Resolve the auth header once for the whole batch
+        if auth_header is None:
+            auth_header = get_auth_header()
+        
         # Create batch request
         batch_req = BatchRequest(
             url=f"https://{base_url}/graphql/knowledgeGraph/v1",
             method='POST',
+            headers=auth_header,
             json_data={'query': query},
+            timeout=GRAPHQL_TIMEOUT,
             request_id=request_key
         )
         
@@ -331,38 +717,33 @@ def fetch_nested_data_batch(base_url, requests_data: List[Dict[str, Any]], max_c
     if batch_requests:
         logger.info(f"Executing {len(batch_requests)} concurrent nested data requests")
         batch_results = batch_http_requests(batch_requests, max_concurrent)
+        unauthorized = False
         
         # Process batch results
         for request_id, response, error in batch_results:
             if error:
                 logger.error(f"Batch nested data request {request_id} failed: {error}")
                 request_mapping[request_id] = None
+                unauthorized = unauthorized or _is_unauthorized(error)
                 continue
             
             try:
-                data = response.json()
+                data = json_loads(response.content)
+                response.close()
                 
-                if 'errors' in data:
-                    logger.error(f"GraphQL errors in batch nested query {request_id}: {data['errors']}")
-                    request_mapping[request_id] = None
-                    continue
+                # Extract field name from request_id
+                field_name = request_id.split(':', 1)[1]
+                result = _extract_nested_items(data, field_name)
+                del data
                 
-                if not data['data']['assets']:
-                    logger.error(f"No asset found in batch nested query response for {request_id}")
+                if result is None:
+                    logger.error(f"Batch nested query {request_id} returned no data")
                     request_mapping[request_id] = None
                     continue
                 
-                # Extract field name from request_id
-                field_name = request_id.split(':', 1)[1]
-                result = data['data']['assets'][0][field_name]
-                
-                # Cache the result
-                asset_id = request_id.split(':', 1)[0]
-                # Find the original request data to get cache parameters
-                orig_req = next((r for r in requests_data if f"{r['asset_id']}:{r['field_name']}" == request_id), None)
-                if orig_req:
-                    cache_key = f"nested_data:{orig_req['asset_type_id']}:{orig_req['asset_id']}:{orig_req['field_name']}:{orig_req.get('nested_limit', 20000)}"
-                    cache = cache_manager.get_nested_data_cache()
+                # Cache the result under the key computed for the original request
+                cache_key = request_cache_keys.get(request_id)
+                if cache_key:
                     cache.put(cache_key, result, ttl=600)
                     increment_counter("nested_data_batch_cached")
                 
@@ -371,6 +752,10 @@ def fetch_nested_data_batch(base_url, requests_data: List[Dict[str, Any]], max_c
             except Exception as e:
                 logger.error(f"Error processing batch nested data response {request_id}: {e}")
                 request_mapping[request_id] = None
+        
+        if unauthorized:
+            # The batch's shared token was rejected; make the next request fetch a new one
+            invalidate_oauth_token()
     
     stop_timer(timer_id)
     
@@ -379,7 +764,7 @@ def fetch_nested_data_batch(base_url, requests_data: List[Dict[str, Any]], max_c
     
     return request_mapping
 
-def fetch_graphql_batch(base_url, queries_data: List[Dict[str, Any]], max_concurrent: int = 5) -> Dict[str, Any]:
+def fetch_graphql_batch(base_url, queries_data: List[Dict[str, Any]], max_concurrent: int = 10) -> Dict[str, Any]:
     """
     Fetch multiple GraphQL queries concurrently for optimal performance.
     
@@ -404,6 +789,8 @@ def fetch_graphql_batch(base_url, queries_data: List[Dict[str, Any]], max_concur
     # Prepare batch requests
     batch_requests = []
     request_mapping = {}
+    cache = cache_manager.get_graphql_cache()
+    auth_header = None
     
     for i, query_data in enumerate(queries_data):
         query = query_data['query']
@@ -415,7 +802,6 @@ def fetch_graphql_batch(base_url, queries_data: List[Dict[str, Any]], max_concur
         
         # Check cache if cache_key provided
         if cache_key:
-            cache = cache_manager.get_graphql_cache()
             cached_result = cache.get(cache_key)
             
             if cached_result is not None:
@@ -427,11 +813,17 @@ def fetch_graphql_batch(base_url, queries_data: List[Dict[str, Any]], max_concur
         logger.debug(f"Cache miss for batch GraphQL query {i}")
         increment_counter("graphql_batch_cache_misses")
         
+        # Resolve the auth header once for the whole batch
+        if auth_header is None:
+            auth_header = get_auth_header()
+        
         # Create batch request
         batch_req = BatchRequest(
             url=f"https://{base_url}/graphql/knowledgeGraph/v1",
             method='POST',
+            headers=auth_header,
             json_data={'query': query, 'variables': variables},
+            timeout=GRAPHQL_TIMEOUT,
             request_id=request_key
         )
         
@@ -442,16 +834,18 @@ def fetch_graphql_batch(base_url, queries_data: List[Dict[str, Any]], max_concur
     if batch_requests:
         logger.info(f"Executing {len(batch_requests)} concurrent GraphQL requests")
         batch_results = batch_http_requests(batch_requests, max_concurrent)
+        unauthorized = False
         
         # Process batch results
         for request_id, response, error in batch_results:
             if error:
                 logger.error(f"Batch GraphQL request {request_id} failed: {error}")
                 request_mapping[request_id] = None
+                unauthorized = unauthorized or _is_unauthorized(error)
                 continue
             
             try:
-                data = response.json()
+                data = json_loads(response.content)
                 
                 if 'errors' in data:
                     logger.error(f"GraphQL errors in batch query {request_id}: {data['errors']}")
@@ -466,7 +860,6 @@ def fetch_graphql_batch(base_url, queries_data: List[Dict[str, Any]], max_concur
                     ttl = query_data.get('ttl', 300)
                     
                     if cache_key:
-                        cache = cache_manager.get_graphql_cache()
                         cache.put(cache_key, data, ttl)
                         increment_counter("graphql_batch_cached")
                 
@@ -475,6 +868,10 @@ def fetch_graphql_batch(base_url, queries_data: List[Dict[str, Any]], max_concur
             except Exception as e:
                 logger.error(f"Error processing batch GraphQL response {request_id}: {e}")
                 request_mapping[request_id] = None
+        
+        if unauthorized:
+            # The batch's shared token was rejected; make the next request fetch a new one
+            invalidate_oauth_token()
     
     stop_timer(timer_id)
     
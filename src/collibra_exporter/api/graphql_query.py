@@ -4,7 +4,13 @@ GraphQL Query Module
 This module provides functions to generate GraphQL queries for the Collibra API.
 """
 
-def get_query(asset_type_id, paginate, nested_offset=0, nested_limit=50):
+from functools import lru_cache
+from string import Template
+
+# Marker substituted for the pagination token when building cached query parts
+_PAGINATE_MARKER = "\x00paginate\x00"
+
+def get_query(asset_type_id, paginate, nested_offset=0, nested_limit=50, field_limits=None):
     """
     Get the main asset query with basic nested_limit.
     
@@ -13,11 +19,36 @@ def get_query(asset_type_id, paginate, nested_offset=0, nested_limit=50):
         paginate: Pagination token or null for first page
         nested_offset: Offset for nested fields
         nested_limit: Limit for nested fields
+        field_limits: Optional mapping of nested field name to a limit overriding nested_limit
         
     Returns:
         str: GraphQL query string
     """
-    return f"""
+    field_limits = tuple(sorted(field_limits.items())) if field_limits else ()
+    head, tail = _get_query_parts(asset_type_id, nested_offset, nested_limit, field_limits)
+    return f"{head}{paginate}{tail}"
+
+@lru_cache(maxsize=1024)
+def _get_query_parts(asset_type_id, nested_offset, nested_limit, field_limits=()):
+    """
+    Build the main asset query once and split it around the pagination token.
+    
+    Args:
+        asset_type_id: ID of the asset type to query
+        nested_offset: Offset for nested fields
+        nested_limit: Limit for nested fields
+        field_limits: Sorted (field name, limit) pairs overriding nested_limit
+        
+    Returns:
+        tuple: The query text before and after the pagination token
+    """
+    paginate = _PAGINATE_MARKER
+    limits = dict.fromkeys((
+        'stringAttributes', 'multiValueAttributes', 'numericAttributes', 'dateAttributes',
+        'booleanAttributes', 'outgoingRelations', 'incomingRelations', 'responsibilities'
+    ), nested_limit)
+    limits.update(field_limits)
+    query = f"""
     query Assets($limit: Int!) {{
         assets(
             where: {{ type: {{ id: {{ eq: "{asset_type_id}" }} }} id:{{gt:{paginate}}} }}
@@ -46,37 +77,37 @@ def get_query(asset_type_id, paginate, nested_offset=0, nested_limit=50):
                     name
                 }}
             }}
-            stringAttributes (offset: {nested_offset}, limit: {nested_limit}) {{
+            stringAttributes (offset: {nested_offset}, limit: {limits['stringAttributes']}) {{
                 type {{
                     name
                 }}
                 stringValue
             }}
-            multiValueAttributes (offset: {nested_offset}, limit: {nested_limit}) {{
+            multiValueAttributes (offset: {nested_offset}, limit: {limits['multiValueAttributes']}) {{
                 type {{
                     name
                 }}
                 stringValues
             }}
-            numericAttributes (offset: {nested_offset}, limit: {nested_limit}) {{
+            numericAttributes (offset: {nested_offset}, limit: {limits['numericAttributes']}) {{
                 type {{
                     name
                 }}
                 numericValue
             }}
-            dateAttributes (offset: {nested_offset}, limit: {nested_limit}) {{
+            dateAttributes (offset: {nested_offset}, limit: {limits['dateAttributes']}) {{
                 type {{
                     name
                 }}
                 dateValue
             }}
-            booleanAttributes (offset: {nested_offset}, limit: {nested_limit}) {{
+            booleanAttributes (offset: {nested_offset}, limit: {limits['booleanAttributes']}) {{
                 type {{
                     name
                 }}
                 booleanValue
             }}
-            outgoingRelations (offset: {nested_offset}, limit: {nested_limit}) {{
+            outgoingRelations (offset: {nested_offset}, limit: {limits['outgoingRelations']}) {{
                 target {{
                     id
                     fullName
@@ -89,7 +120,7 @@ def get_query(asset_type_id, paginate, nested_offset=0, nested_limit=50):
                     role
                 }}
             }}
-            incomingRelations (offset: {nested_offset}, limit: {nested_limit}) {{
+            incomingRelations (offset: {nested_offset}, limit: {limits['incomingRelations']}) {{
                 source {{
                     id
                     fullName
@@ -102,7 +133,7 @@ def get_query(asset_type_id, paginate, nested_offset=0, nested_limit=50):
                     corole
                 }}
             }}
-            responsibilities (offset: {nested_offset}, limit: {nested_limit}) {{
+            responsibilities (offset: {nested_offset}, limit: {limits['responsibilities']}) {{
                 role {{
                     name
                 }}
@@ -114,6 +145,8 @@ def get_query(asset_type_id, paginate, nested_offset=0, nested_limit=50):
         }}
     }}
     """
+    head, tail = query.split(_PAGINATE_MARKER)
+    return head, tail
 
 def get_nested_query(asset_type_id, asset_id, field_name, nested_offset=0, nested_limit=20000):
     """
@@ -129,13 +162,73 @@ def get_nested_query(asset_type_id, asset_id, field_name, nested_offset=0, neste
     Returns:
         str: GraphQL query string
         
+    Raises:
+        ValueError: If field_name is not supported
+    """
+    template = get_nested_query_template(asset_type_id, field_name)
+    return template.substitute(asset_id=asset_id, offset=nested_offset, limit=nested_limit)
+
+@lru_cache(maxsize=1024)
+def get_nested_query_template(asset_type_id, field_name):
+    """
+    Get the precompiled nested field query for an asset type.
+    
+    The template is built once per asset type and field; callers only
+    substitute the $asset_id, $offset and $limit placeholders.
+    
+    Args:
+        asset_type_id: ID of the asset type
+        field_name: Name of the nested field to fetch
+        
+    Returns:
+        string.Template: Query template with $asset_id, $offset and $limit placeholders
+        
     Raises:
         ValueError: If field_name is not supported
     """
     # Base query structure with limit=1 to ensure we only get one asset
-    base_query = f"""
-    query Assets {{
+    base_query = """
+    query Assets {
         assets(
+            where: { 
+                type: { id: { eq: "$asset_type_id" } }
+                id: { eq: "$asset_id" }
+            }
+            limit: 1
+        ) {
+            id
+    """
+
+    # Fix the asset type now and leave the per-request placeholders in place
+    query = Template(base_query + _get_nested_field_selection(field_name) + "}}")
+    return Template(query.safe_substitute(asset_type_id=asset_type_id))
+
+def get_nested_pages_query(asset_type_id, asset_id, field_name, offsets, nested_limit=20000):
+    """
+    Generate a single query fetching several pages of a nested field using aliases.
+    
+    Each page is selected under its own alias (page0, page1, ...) so that
+    multiple offsets can be retrieved in one round-trip.
+    
+    Args:
+        asset_type_id: ID of the asset type
+        asset_id: ID of the specific asset
+        field_name: Name of the nested field to fetch
+        offsets: Offsets of the pages to fetch, one alias per offset
+        nested_limit: Limit for number of nested items per page
+        
+    Returns:
+        str: GraphQL query string
+        
+    Raises:
+        ValueError: If field_name is not supported
+    """
+    field_template = Template(_get_nested_field_selection(field_name))
+
+    pages = []
+    for page_index, nested_offset in enumerate(offsets):
+        pages.append(f"""
+        page{page_index}: assets(
             where: {{ 
                 type: {{ id: {{ eq: "{asset_type_id}" }} }}
                 id: {{ eq: "{asset_id}" }}
@@ -143,97 +236,148 @@ def get_nested_query(asset_type_id, asset_id, field_name, nested_offset=0, neste
             limit: 1
         ) {{
             id
+            {field_template.substitute(offset=nested_offset, limit=nested_limit)}
+        }}""")
+
+    return "\n    query Assets {" + "".join(pages) + "\n    }\n    "
+
+def get_nested_bulk_query(asset_type_id, asset_fields, nested_limit=20000):
+    """
+    Generate a single query fetching nested fields of several assets using aliases.
+    
+    Each asset is selected under its own alias (asset0, asset1, ...) together
+    with all of its requested fields, so that one round-trip covers them all.
+    
+    Args:
+        asset_type_id: ID of the asset type
+        asset_fields: List of (asset_id, field names) pairs, one alias per pair
+        nested_limit: Limit for number of nested items per field
+        
+    Returns:
+        str: GraphQL query string
+        
+    Raises:
+        ValueError: If a field name is not supported
     """
+    selections = []
+    for asset_index, (asset_id, field_names) in enumerate(asset_fields):
+        fields = "".join(
+            Template(_get_nested_field_selection(field_name)).substitute(offset=0, limit=nested_limit)
+            for field_name in field_names
+        )
+        selections.append(f"""
+        asset{asset_index}: assets(
+            where: {{ 
+                type: {{ id: {{ eq: "{asset_type_id}" }} }}
+                id: {{ eq: "{asset_id}" }}
+            }}
+            limit: 1
+        ) {{
+            id
+            {fields}
+        }}""")
 
-    # Field-specific query parts with pagination parameters
-    field_queries = {
-        'stringAttributes': f"""
-            stringAttributes(offset: {nested_offset}, limit: {nested_limit}) {{
-                type {{
+    return "\n    query Assets {" + "".join(selections) + "\n    }\n    "
+
+# Field-specific selections with $offset and $limit pagination placeholders
+_NESTED_FIELD_SELECTIONS = {
+    'stringAttributes': """
+            stringAttributes(offset: $offset, limit: $limit) {
+                type {
                     name
-                }}
+                }
                 stringValue
-            }}
+            }
         """,
-        'multiValueAttributes': f"""
-            multiValueAttributes(offset: {nested_offset}, limit: {nested_limit}) {{
-                type {{
+    'multiValueAttributes': """
+            multiValueAttributes(offset: $offset, limit: $limit) {
+                type {
                     name
-                }}
+                }
                 stringValues
-            }}
+            }
         """,
-        'numericAttributes': f"""
-            numericAttributes(offset: {nested_offset}, limit: {nested_limit}) {{
-                type {{
+    'numericAttributes': """
+            numericAttributes(offset: $offset, limit: $limit) {
+                type {
                     name
-                }}
+                }
                 numericValue
-            }}
+            }
         """,
-        'dateAttributes': f"""
-            dateAttributes(offset: {nested_offset}, limit: {nested_limit}) {{
-                type {{
+    'dateAttributes': """
+            dateAttributes(offset: $offset, limit: $limit) {
+                type {
                     name
-                }}
+                }
                 dateValue
-            }}
+            }
         """,
-        'booleanAttributes': f"""
-            booleanAttributes(offset: {nested_offset}, limit: {nested_limit}) {{
-                type {{
+    'booleanAttributes': """
+            booleanAttributes(offset: $offset, limit: $limit) {
+                type {
                     name
-                }}
+                }
                 booleanValue
-            }}
+            }
         """,
-        'outgoingRelations': f"""
-            outgoingRelations(offset: {nested_offset}, limit: {nested_limit}) {{
-                target {{
+    'outgoingRelations': """
+            outgoingRelations(offset: $offset, limit: $limit) {
+                target {
                     id
                     fullName
                     displayName
-                    type {{
+                    type {
                         name
-                    }}
-                }}
-                type {{
+                    }
+                }
+                type {
                     role
-                }}
-            }}
+                }
+            }
         """,
-        'incomingRelations': f"""
-            incomingRelations(offset: {nested_offset}, limit: {nested_limit}) {{
-                type {{
+    'incomingRelations': """
+            incomingRelations(offset: $offset, limit: $limit) {
+                type {
                     corole
-                }}
-                source {{
+                }
+                source {
                     id
                     fullName
                     displayName
-                    type {{
+                    type {
                         name
-                    }}
-                }}
-            }}
+                    }
+                }
+            }
         """,
-        'responsibilities': f"""
-            responsibilities(offset: {nested_offset}, limit: {nested_limit}) {{
-                role {{
+    'responsibilities': """
+            responsibilities(offset: $offset, limit: $limit) {
+                role {
                     name
-                }}
-                user {{
+                }
+                user {
                     fullName
                     email
-                }}
-            }}
+                }
+            }
         """
-    }
+}
 
-    if field_name not in field_queries:
+def _get_nested_field_selection(field_name):
+    """
+    Get the selection for a single nested field with pagination placeholders.
+    
+    Args:
+        field_name: Name of the nested field to fetch
+        
+    Returns:
+        str: GraphQL selection for the field with $offset and $limit placeholders
+        
+    Raises:
+        ValueError: If field_name is not supported
+    """
+    if field_name not in _NESTED_FIELD_SELECTIONS:
         raise ValueError(f"Unsupported field name: {field_name}")
 
-    # Construct the complete query
-    complete_query = base_query + field_queries[field_name] + "}}"
-
-    return complete_query
+    return _NESTED_FIELD_SELECTIONS[field_name]
@@ -1,93 +1,361 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 import logging
 import time
+import threading
+from types import MappingProxyType
+from urllib.parse import urlencode
 from dotenv import load_dotenv
 from functools import lru_cache
-# Removed module-level imports to avoid circular dependencies
-# These will be imported locally where needed
+# Utils imports are bound lazily (see _lazy_init) to avoid circular dependencies
 
 load_dotenv(override=True)
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 session = requests.Session()
 
+# Keep-alive pool shared by all threads, retrying transient gateway errors on the token POST
+_token_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["POST"],
+        raise_on_status=False
+    )
+)
+session.mount("https://", _token_adapter)
+session.mount("http://", _token_adapter)
+session.headers.update({'Accept': 'application/json'})
+
+# Token request parts, fixed for the lifetime of the process
+_TOKEN_URL = f"https://{os.getenv('COLLIBRA_INSTANCE_URL')}/rest/oauth/v2/token"
+_TOKEN_PAYLOAD = urlencode({
+    'client_id': os.getenv('CLIENT_ID'),
+    'grant_type': 'client_credentials',
+    'client_secret': os.getenv('CLIENT_SECRET')
+}).encode('ascii')
+_TOKEN_HEADERS = {
+    'Content-Type': 'application/x-www-form-urlencoded'
+}
+# (connect, read) timeouts for the token request
+_TOKEN_TIMEOUT = (
+    float(os.getenv('OAUTH_CONNECT_TIMEOUT', '3.05')),
+    float(os.getenv('OAUTH_READ_TIMEOUT', '10'))
+)
+
+# Optional on-disk copy of the token so short runs can skip the token request at startup
+_PERSIST_TOKEN = os.getenv('COLLIBRA_PERSIST_TOKEN', 'false').lower() == 'true'
+_TOKEN_FILE = os.path.join(
+    os.path.expanduser(os.getenv('COLLIBRA_CACHE_DIR', '~/.collibra_exporter')),
+    'oauth_token.json'
+)
+
+def _read_persisted_token():
+    """
+    Read the token persisted by a previous run.
+    
+    Returns:
+        dict: The token and its wall-clock expiration_time, or None if there is no
+              usable token for this instance and client
+    """
+    try:
+        with open(_TOKEN_FILE, 'rb') as token_file:
+            token_data = _json_loads(token_file.read())
+    except (OSError, ValueError):
+        return None
+    
+    if token_data.get('token_url') != _TOKEN_URL or token_data.get('client_id') != os.getenv('CLIENT_ID'):
+        return None
+    return token_data
+
+def _write_persisted_token(token, expiration_time):
+    """
+    Persist the token, readable by the current user only.
+    
+    The file is written under a per-process temporary name and moved into
+    place with os.replace, so concurrent runs never see a partial file.
+    
+    Args:
+        token: The access token
+        expiration_time: Wall-clock expiry of the token
+    """
+    payload = _json_dumps({
+        'token_url': _TOKEN_URL,
+        'client_id': os.getenv('CLIENT_ID'),
+        'token': token,
+        'expiration_time': expiration_time
+    })
+    
+    temp_file = f"{_TOKEN_FILE}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(_TOKEN_FILE), mode=0o700, exist_ok=True)
+        fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as token_file:
+            token_file.write(payload)
+        os.replace(temp_file, _TOKEN_FILE)
+    except OSError as e:
+        logger.warning(f"Could not persist OAuth token: {e}")
+
+def _delete_persisted_token():
+    """Remove the persisted token, e.g. after the server rejected it."""
+    try:
+        os.remove(_TOKEN_FILE)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not remove persisted OAuth token: {e}")
+
+# Retry delays of the background refresher after a failed refresh, in seconds
+_REFRESH_RETRY_BASE_DELAY = 1
+_REFRESH_RETRY_MAX_DELAY = 60
+
+# Token hits are reported to the performance counters once per this many hits
+AUTH_HIT_SAMPLE_RATE = 1024
+
+# Utils helpers bound on first use; importing them at module load would be circular
+_cache_manager = None
+_increment_counter = None
+_json_loads = None
+_json_dumps = None
+
+def _lazy_init():
+    """Bind the cache manager, counter and JSON helpers once."""
+    global _cache_manager, _increment_counter, _json_loads, _json_dumps
+    if _cache_manager is None:
+        from ..utils.cache_manager import cache_manager
+        from ..utils.performance_monitor import increment_counter
+        from ..utils.json_codec import json_loads, json_dumps
+        _json_loads = json_loads
+        _json_dumps = json_dumps
+        _increment_counter = increment_counter
+        _cache_manager = cache_manager
+
 class OAuthTokenManager:
     def __init__(self):
         self._token = None
+        # Expiry of self._token on the time.monotonic() clock; the shared auth
+        # cache keeps a wall-clock expiration_time instead
         self._expiration_time = 0
+        # Authorization header for the current token, rebuilt only when the token changes
+        self._auth_header = None
         # Add buffer time (30 seconds) to refresh before actual expiration
         self._refresh_buffer = 30
+        # Serializes refreshes so concurrent callers don't all fetch a new token
+        self._lock = threading.Lock()
+        # Background thread renewing the token before it expires
+        self._refresh_thread = None
+        self._stop_event = threading.Event()
+        # Hits served from the manager's own token, reported to the counters in samples
+        self._local_hits = 0
+        # The persisted token is only considered once, on the first token request
+        self._persisted_token_checked = False
 
     def get_valid_token(self):
         """Get a valid OAuth token, refreshing if necessary."""
-        # Import locally to avoid circular dependencies
-        from ..utils.cache_manager import cache_manager
-        from ..utils.performance_monitor import increment_counter
+        _lazy_init()
+        
+        current_time = time.monotonic()
         
-        current_time = time.time()
+        # The token held by this manager is authoritative while it is valid;
+        # the shared auth cache is only needed on cold start or near expiry
+        if self._token and current_time < self._expiration_time - self._refresh_buffer:
+            self._local_hits += 1
+            if self._local_hits % AUTH_HIT_SAMPLE_RATE == 0:
+                _increment_counter("auth_cache_hits", AUTH_HIT_SAMPLE_RATE)
+            return self._token
         
         # Check cache first
-        auth_cache = cache_manager.get_auth_cache()
+        auth_cache = _cache_manager.get_auth_cache()
         cached_token = auth_cache.get("oauth_token")
         
-        if cached_token and cached_token.get('expiration_time', 0) > (current_time + self._refresh_buffer):
-            increment_counter("auth_cache_hits")
-            self._token = cached_token['token']
-            self._expiration_time = cached_token['expiration_time']
+        if cached_token and cached_token.get('expiration_time', 0) > (time.time() + self._refresh_buffer):
+            _increment_counter("auth_cache_hits")
+            self._set_cached_token(cached_token)
             return self._token
         
-        increment_counter("auth_cache_misses")
+        _increment_counter("auth_cache_misses")
         
         # Check if token is expired or will expire soon
         if not self._token or current_time >= (self._expiration_time - self._refresh_buffer):
-            self._fetch_new_token()
+            with self._lock:
+                # Another thread may have refreshed the token while we waited
+                cached_token = auth_cache.get("oauth_token")
+                if cached_token and cached_token.get('expiration_time', 0) > (time.time() + self._refresh_buffer):
+                    self._set_cached_token(cached_token)
+                    return self._token
+                
+                # On cold start, reuse a still-valid token from a previous run
+                if not self._persisted_token_checked:
+                    self._persisted_token_checked = True
+                    if _PERSIST_TOKEN and self._load_persisted_token():
+                        self._start_background_refresh()
+                        return self._token
+                
+                self._fetch_new_token()
+                self._start_background_refresh()
             
         return self._token
 
-    def _fetch_new_token(self):
-        """Fetch a new OAuth token from the server."""
-        # Import locally to avoid circular dependencies
-        from ..utils.cache_manager import cache_manager
-        from ..utils.performance_monitor import increment_counter
+    def _load_persisted_token(self):
+        """
+        Adopt the token persisted by a previous run if it is still valid.
         
-        client_id = os.getenv('CLIENT_ID')
-        client_secret = os.getenv('CLIENT_SECRET')
-        base_url = os.getenv('COLLIBRA_INSTANCE_URL')
+        Returns:
+            bool: True if a persisted token was adopted
+        """
+        persisted_token = _read_persisted_token()
+        if not persisted_token:
+            return False
         
-        url = f"https://{base_url}/rest/oauth/v2/token"
-        headers = {
-            'Accept': 'application/json',
-            'Content-Type': 'application/x-www-form-urlencoded'
-        }
+        remaining = persisted_token['expiration_time'] - time.time()
+        if remaining <= self._refresh_buffer:
+            return False
         
-        payload = f'client_id={client_id}&grant_type=client_credentials&client_secret={client_secret}'
+        self._set_cached_token(persisted_token)
+        _cache_manager.get_auth_cache().put("oauth_token", {
+            'token': persisted_token['token'],
+            'expiration_time': persisted_token['expiration_time']
+        }, ttl=remaining - self._refresh_buffer - 10)
+        _increment_counter("auth_tokens_loaded_from_disk")
+        logger.info("Reusing persisted OAuth token")
+        return True
+
+    def _start_background_refresh(self):
+        """Start the background refresher if it is not already running."""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop,
+            name="OAuthTokenRefresher",
+            daemon=True
+        )
+        self._refresh_thread.start()
+
+    def _refresh_delay(self):
+        """
+        Seconds until the background refresher should renew the current token.
+        
+        Tokens are renewed two refresh buffers before expiry, or at half their
+        remaining lifetime if that is later, so short-lived tokens are not
+        renewed back to back.
+        """
+        remaining = self._expiration_time - time.monotonic()
+        return max(remaining - 2 * self._refresh_buffer, remaining / 2)
+
+    def _refresh_loop(self):
+        """Renew the token ahead of expiry so request threads never wait for it."""
+        failures = 0
+        while True:
+            if failures:
+                # Back off exponentially while the token endpoint keeps failing
+                delay = min(_REFRESH_RETRY_MAX_DELAY, _REFRESH_RETRY_BASE_DELAY * 2 ** (failures - 1))
+            else:
+                delay = max(1, self._refresh_delay())
+            if self._stop_event.wait(delay):
+                return
+            try:
+                with self._lock:
+                    # A request thread may have renewed the token while we waited
+                    if self._refresh_delay() > 1:
+                        failures = 0
+                        continue
+                    self._fetch_new_token()
+                failures = 0
+            except Exception as e:
+                failures += 1
+                logger.warning(f"Background OAuth token refresh failed (attempt {failures}): {e}")
+
+    def stop_background_refresh(self):
+        """Stop the background refresher."""
+        self._stop_event.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join(timeout=5)
+            self._refresh_thread = None
+
+    def get_auth_header(self):
+        """Get the authorization header, reusing it while the token is valid."""
+        # Read the header once; invalidate_token may clear it concurrently
+        auth_header = self._auth_header
+        if auth_header is not None and time.monotonic() < self._expiration_time - self._refresh_buffer:
+            return auth_header
+        while True:
+            self.get_valid_token()
+            auth_header = self._auth_header
+            if auth_header is not None:
+                return auth_header
+
+    def _set_cached_token(self, cached_token):
+        """Adopt a token from the auth cache, converting its wall-clock expiry."""
+        remaining = cached_token['expiration_time'] - time.time()
+        self._set_token(cached_token['token'], time.monotonic() + remaining)
+
+    def _set_token(self, token, expiration_time):
+        """Store a token, expiring at the given time.monotonic() value, and its authorization header."""
+        if token != self._token or self._auth_header is None:
+            # Read-only, since the same mapping is handed to every caller
+            self._auth_header = MappingProxyType({'Authorization': f'Bearer {token}'})
+        self._token = token
+        self._expiration_time = expiration_time
+
+    def invalidate_token(self):
+        """Discard the current token so the next request fetches a new one."""
+        _lazy_init()
+        
+        self._token = None
+        self._expiration_time = 0
+        self._auth_header = None
+        _cache_manager.get_auth_cache().clear()
+        # The server rejected the token, so a persisted copy must not be reused
+        self._persisted_token_checked = True
+        if _PERSIST_TOKEN:
+            _delete_persisted_token()
+        logger.info("OAuth token invalidated")
+
+    def _fetch_new_token(self):
+        """Fetch a new OAuth token from the server."""
+        _lazy_init()
         
         try:
-            response = session.post(url=url, data=payload, headers=headers)
-            response.raise_for_status()
-            token_data = response.json()
+            # session.post rather than sending a prepared request, so proxy and CA
+            # bundle settings from the environment apply and redirects are followed
+            response = session.post(_TOKEN_URL, data=_TOKEN_PAYLOAD, headers=_TOKEN_HEADERS, timeout=_TOKEN_TIMEOUT)
+            try:
+                response.raise_for_status()
+                token_data = _json_loads(response.content)
+            finally:
+                # Return the connection to the pool right away
+                response.close()
             
-            self._token = token_data["access_token"]
             # Set expiration time based on server response
-            self._expiration_time = time.time() + token_data["expires_in"]
+            expires_in = token_data["expires_in"]
+            self._set_token(token_data["access_token"], time.monotonic() + expires_in)
             
-            # Cache the token
-            auth_cache = cache_manager.get_auth_cache()
+            # Cache the token with a wall-clock expiry for other consumers of the cache
+            auth_cache = _cache_manager.get_auth_cache()
             token_cache_data = {
                 'token': self._token,
-                'expiration_time': self._expiration_time
+                'expiration_time': time.time() + expires_in
             }
             # Cache with TTL slightly less than actual expiration
-            cache_ttl = token_data["expires_in"] - self._refresh_buffer - 10
+            cache_ttl = expires_in - self._refresh_buffer - 10
             auth_cache.put("oauth_token", token_cache_data, ttl=cache_ttl)
-            increment_counter("auth_tokens_cached")
+            _increment_counter("auth_tokens_cached")
+            
+            if _PERSIST_TOKEN:
+                _write_persisted_token(self._token, token_cache_data['expiration_time'])
             
-            logging.info("Successfully obtained and cached new OAuth token")
+            logger.info("Successfully obtained and cached new OAuth token")
             
         except requests.RequestException as e:
-            logging.error(f"Error obtaining OAuth token: {e}")
+            logger.error(f"Error obtaining OAuth token: {e}")
             raise
 
 # Create a singleton instance
@@ -97,6 +365,14 @@ def get_oauth_token():
     """Get a valid OAuth token."""
     return token_manager.get_valid_token()
 
+def stop_token_refresh():
+    """Stop refreshing the OAuth token in the background."""
+    token_manager.stop_background_refresh()
+
+def invalidate_oauth_token():
+    """Invalidate the current OAuth token, e.g. after a 401 response."""
+    token_manager.invalidate_token()
+
 def get_auth_header():
-    """Get the authorization header with a valid token."""
-    return {'Authorization': f'Bearer {get_oauth_token()}'}
+    """Get the authorization header with a valid token, as a read-only mapping."""
+    return token_manager.get_auth_header()
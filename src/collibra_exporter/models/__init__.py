@@ -4,20 +4,37 @@ Models Module
 This module contains data models and structures used for representing Collibra assets and their attributes.
 """
 
-from .transformer import flatten_json
-from .exporter import (
-    Neo4jExporter,
-    create_neo4j_exporter_from_env,
-    export_flattened_data_to_neo4j,
-    export_batch_to_neo4j,
-    integrate_neo4j_export
-)
+import importlib
+
+# Public names and the submodule defining each; resolved on first access (PEP 562)
+# so that importing flatten_json does not pull in the neo4j driver
+_LAZY = {
+    'flatten_json': '.transformer',
+    'make_flattener': '.transformer',
+    'Neo4jExporter': '.exporter',
+    'create_neo4j_exporter_from_env': '.exporter',
+    'export_flattened_data_to_neo4j': '.exporter',
+    'export_batch_to_neo4j': '.exporter',
+    'integrate_neo4j_export': '.exporter',
+}
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
 
 # If you have a separate save_data function in another file, import it here
 # from .data_saver import save_data
 
 __all__ = [
     'flatten_json',
+    'make_flattener',
     'Neo4jExporter',
     'create_neo4j_exporter_from_env',
     'export_flattened_data_to_neo4j',
@@ -5,35 +5,227 @@ This module provides functionality for exporting flattened Collibra data to Neo4
 """
 
 import os
+import atexit
 import logging
 import threading
-from typing import Dict, List, Any, Optional
-from neo4j import GraphDatabase
+from typing import Dict, List, Any, Iterable, Optional
+from neo4j import GraphDatabase, unit_of_work
 from dotenv import load_dotenv
 import re
+from collections import defaultdict
+from functools import lru_cache
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from ..utils.performance_monitor import start_timer, stop_timer, increment_counter
 
+load_dotenv()
+
 logger = logging.getLogger(__name__)
 
-class Neo4jConnectionPool:
-    """Thread-safe Neo4j connection pool manager."""
+# Bolt connections kept per Neo4j driver, shared by all writer threads
+NEO4J_MAX_CONNECTION_POOL_SIZE = int(os.getenv('NEO4J_MAX_CONNECTION_POOL_SIZE', '50'))
+
+# Sanitization patterns, compiled once for the per-property hot path
+_NON_WORD_RE = re.compile(r'[^\w]')
+_MULTI_UNDERSCORE_RE = re.compile(r'_+')
+# Maps every ASCII non-word character to an underscore, for names that are pure ASCII
+_SANITIZE_TABLE = str.maketrans({
+    c: '_' for c in map(chr, range(128)) if not (c.isalnum() or c == '_')
+})
+
+@lru_cache(maxsize=4096)
+def _sanitize_name(name: str) -> str:
+    """
+    Sanitize a label, relationship type or property name for Neo4j.
+    
+    Memoized, since the same few names are sanitized for every asset.
+    
+    Args:
+        name: Original name
+        
+    Returns:
+        str: Name with special characters replaced by single underscores
+    """
+    # Replace spaces and special characters with underscores, collapse runs
+    # of underscores and remove leading/trailing underscores
+    if name.isascii():
+        return '_'.join(filter(None, name.translate(_SANITIZE_TABLE).split('_')))
+    # Unicode word characters need the regex definition of \w
+    return _MULTI_UNDERSCORE_RE.sub('_', _NON_WORD_RE.sub('_', name)).strip('_')
+
+@lru_cache(maxsize=8192)
+def _extract_relation_info(property_name: str) -> Optional[tuple]:
+    """
+    Extract relation information from property name using the pattern:
+    {asset_type_name}__{role_type}__{target_type}
+    
+    Memoized, since every asset of a type shares the same property names.
+    
+    Args:
+        property_name: Property name containing relation information
+        
+    Returns:
+        tuple or None: (role_type, target_node_type) if relation property
+    """
+    # Split by double underscores
+    parts = property_name.split('__')
+    
+    if len(parts) == 3:
+        # parts[0] = asset_type_name (source)
+        # parts[1] = role_type (relationship)
+        # parts[2] = target_type (target node type)
+        role_type = parts[1]
+        target_type = parts[2]
+        return role_type, target_type
+    
+    return None
+
+def _find_responsibility_keys(keys: frozenset) -> tuple:
+    """
+    Find the responsibility keys (case-insensitive) of a flattened asset.
+    
+    Args:
+        keys: Keys of the flattened asset
+        
+    Returns:
+        tuple: (user_name_key, user_role_key, user_email_key), each None if absent
+    """
+    return _build_key_plan(keys)['responsibility_keys']
+
+def _split_list_value(value: Any) -> List[str]:
+    """
+    Split a comma-separated flattened value into its stripped, non-empty items.
     
-    _instance = None
-    _lock = threading.Lock()
+    Args:
+        value: Flattened value, may be None
+        
+    Returns:
+        List[str]: Items of the value
+    """
+    if value is None:
+        return []
+    return [item for item in map(str.strip, str(value).split(',')) if item]
+
+@lru_cache(maxsize=256)
+def _build_key_plan(keys: frozenset) -> Dict[str, Any]:
+    """
+    Classify the keys of a flattened asset.
+    
+    Assets of the same type share their key set, so the classification is
+    computed once per distinct key set. The returned plan is shared and must
+    not be modified.
+    
+    Args:
+        keys: Keys of the flattened asset
+        
+    Returns:
+        dict: Plan with
+            - resp_keys: responsibility keys, which are not node properties
+            - responsibility_keys: (user_name_key, user_role_key, user_email_key)
+            - relation_keys: relation "_Full Name" keys mapped to (role_type, target_node_type)
+            - skip_keys: Full Name keys and relation keys superseded by their "_Full Name" version
+            - property_keys: keys of regular node properties
+    """
+    resp_keys = []
+    user_name_key = None
+    user_role_key = None
+    user_email_key = None
+    relation_keys = {}
+    skip_keys = set()
+    property_keys = []
     
-    def __new__(cls):
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-        return cls._instance
+    # Keys with a "_Full Name" sibling, found in one pass instead of building
+    # f"{key}_Full Name" for every key
+    full_name_bases = {key[:-10] for key in keys if key.endswith("_Full Name")}
+    
+    for key in keys:
+        # Lower-cased once per key set; assets never lower-case their keys
+        key_lower = key.lower()
+        if 'user name against' in key_lower:
+            user_name_key = key
+            resp_keys.append(key)
+        elif 'user role against' in key_lower:
+            user_role_key = key
+            resp_keys.append(key)
+        elif 'user email against' in key_lower:
+            user_email_key = key
+            resp_keys.append(key)
+        elif key.endswith(" Full Name"):
+            # A Full Name property but not a relation (like the main node's Full Name)
+            skip_keys.add(key)
+        elif key.endswith("_Full Name"):
+            relation_info = _extract_relation_info(key[:-10])  # Remove "_Full Name"
+            if relation_info is not None:
+                # This contains the actual node names for the relation
+                relation_keys[key] = relation_info
+            else:
+                skip_keys.add(key)
+        elif key in full_name_bases:
+            # A relation property, the "_Full Name" version is used instead
+            skip_keys.add(key)
+        else:
+            property_keys.append(key)
+    
+    return {
+        'resp_keys': tuple(resp_keys),
+        'responsibility_keys': (user_name_key, user_role_key, user_email_key),
+        'relation_keys': relation_keys,
+        'skip_keys': frozenset(skip_keys),
+        'property_keys': tuple(property_keys)
+    }
+
+def _is_meaningful(value: Any) -> bool:
+    """
+    Check whether a flattened value is worth writing, i.e. not None or blank.
+    
+    Non-string values are never blank, so they are not stringified, and
+    strings are checked without building a stripped copy.
+    
+    Args:
+        value: Flattened value
+        
+    Returns:
+        bool: True if the value is not None, empty or whitespace only
+    """
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return bool(value) and not value.isspace()
+    return True
+
+def _plan_properties(plan: Dict[str, Any], flattened_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pick the non-empty regular node properties of an asset.
+    
+    Args:
+        plan: Key plan for the asset's keys
+        flattened_data: Flattened asset data
+        
+    Returns:
+        Dict[str, Any]: Node properties
+    """
+    node_properties = {}
+    for key in plan['property_keys']:
+        value = flattened_data[key]
+        if _is_meaningful(value):
+            node_properties[key] = value
+    return node_properties
+
+class Neo4jConnectionPool:
+    """Thread-safe Neo4j connection pool manager."""
     
     def __init__(self):
-        if not hasattr(self, 'initialized'):
-            self.drivers = {}
-            self.driver_lock = threading.Lock()
-            self.initialized = True
+        # Read without locking; entries are added under their key's creation lock
+        self.drivers = {}
+        # Guards creation_locks and mutation of drivers
+        self.driver_lock = threading.Lock()
+        # Per-driver-key locks so creating one driver does not block lookups of others
+        self.creation_locks = defaultdict(threading.Lock)
+        # Drivers whose connectivity has been verified
+        self.verified_drivers = set()
+        # Close explicitly at exit rather than from __del__, which may run
+        # after the neo4j module has been torn down
+        atexit.register(self.close_all)
     
     def get_driver(self, uri: str, username: str, password: str, database: str = "neo4j"):
         """
@@ -50,40 +242,87 @@ class Neo4jConnectionPool:
         """
         driver_key = f"{uri}:{username}:{database}"
         
+        driver = self.drivers.get(driver_key)
+        if driver is not None:
+            logger.debug(f"Reusing existing Neo4j driver for {uri}")
+            increment_counter("neo4j_drivers_reused")
+            return driver, database
+        
         with self.driver_lock:
-            if driver_key not in self.drivers:
+            creation_lock = self.creation_locks[driver_key]
+        
+        with creation_lock:
+            # Another thread may have created the driver while we waited
+            driver = self.drivers.get(driver_key)
+            if driver is None:
                 logger.info(f"Creating new Neo4j driver for {uri}")
                 increment_counter("neo4j_drivers_created")
                 
-                self.drivers[driver_key] = GraphDatabase.driver(
+                driver = GraphDatabase.driver(
                     uri, 
                     auth=(username, password),
                     max_connection_lifetime=3600,  # 1 hour
-                    max_connection_pool_size=50,   # Increased pool size
+                    max_connection_pool_size=NEO4J_MAX_CONNECTION_POOL_SIZE,
                     connection_acquisition_timeout=60,  # 60 seconds timeout
                     keep_alive=True
                 )
+                with self.driver_lock:
+                    self.drivers[driver_key] = driver
                 logger.info(f"Neo4j driver created with connection pooling")
             else:
                 logger.debug(f"Reusing existing Neo4j driver for {uri}")
                 increment_counter("neo4j_drivers_reused")
         
-        return self.drivers[driver_key], database
+        return driver, database
+    
+    def verify_connectivity(self, driver):
+        """
+        Verify that a pooled driver can reach the server, once per driver.
+        
+        Args:
+            driver: Neo4j driver from get_driver
+            
+        Raises:
+            Exception: The driver's error if the server cannot be reached
+        """
+        if driver in self.verified_drivers:
+            return
+        
+        try:
+            driver.verify_connectivity()
+        except Exception as e:
+            logger.error(f"Failed to connect to Neo4j database: {str(e)}")
+            raise
+        
+        self.verified_drivers.add(driver)
+        increment_counter("neo4j_connectivity_verified")
     
     def close_all(self):
         """Close all drivers in the pool."""
+        # Detach the drivers under the lock, close them outside it
         with self.driver_lock:
-            for driver_key, driver in self.drivers.items():
-                try:
-                    driver.close()
-                    logger.info(f"Closed Neo4j driver: {driver_key}")
-                except Exception as e:
-                    logger.warning(f"Error closing driver {driver_key}: {e}")
+            drivers = list(self.drivers.items())
             self.drivers.clear()
+            self.verified_drivers.clear()
+        
+        for driver_key, driver in drivers:
+            try:
+                driver.close()
+                logger.info(f"Closed Neo4j driver: {driver_key}")
+            except Exception as e:
+                logger.warning(f"Error closing driver {driver_key}: {e}")
+        # The shared exporter holds a closed driver now
+        create_neo4j_exporter_from_env.cache_clear()
+
+@lru_cache(maxsize=None)
+def get_connection_pool() -> Neo4jConnectionPool:
+    """
+    Get the process-wide Neo4j connection pool.
     
-    def __del__(self):
-        """Cleanup when the pool is destroyed."""
-        self.close_all()
+    Returns:
+        Neo4jConnectionPool: The shared pool instance
+    """
+    return Neo4jConnectionPool()
 
 class Neo4jExporter:
     """Handles exporting flattened Collibra data to Neo4j database with connection pooling."""
@@ -98,11 +337,16 @@ class Neo4jExporter:
             password: Neo4j password
             database: Neo4j database name
         """
-        self.pool = Neo4jConnectionPool()
+        self.pool = get_connection_pool()
         self.driver, self.database = self.pool.get_driver(uri, username, password, database)
         self.uri = uri
         self.username = username
         self.password = password
+        # Sanitized labels whose uniqueness constraint has already been ensured
+        self._constraints_created = set()
+        # Cypher texts by sanitized label / relationship kind, see _node_merge_query
+        self._node_merge_query_cache = {}
+        self._relationship_query_cache = {}
         
     def close(self):
         """Connection pool manages connections, so this is a no-op."""
@@ -144,220 +388,69 @@ class Neo4jExporter:
         Returns:
             str: Sanitized property name
         """
-        # Replace spaces and special characters with underscores
-        sanitized = re.sub(r'[^\w]', '_', name)
-        # Remove multiple consecutive underscores
-        sanitized = re.sub(r'_+', '_', sanitized)
-        # Remove leading/trailing underscores
-        sanitized = sanitized.strip('_')
-        return sanitized
+        return _sanitize_name(name)
     
-    def _extract_relation_info(self, property_name: str) -> Optional[tuple]:
+    def _sanitize_properties(self, properties: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Extract relation information from property name using the pattern:
-        {asset_type_name}__{role_type}__{target_type}
+        Sanitize property names and drop None/empty values.
         
         Args:
-            property_name: Property name containing relation information
+            properties: Original properties
             
         Returns:
-            tuple or None: (role_type, target_node_type) if relation property
+            Dict[str, Any]: Properties with sanitized names
         """
-        # Split by double underscores
-        parts = property_name.split('__')
-        
-        if len(parts) == 3:
-            # parts[0] = asset_type_name (source)
-            # parts[1] = role_type (relationship)
-            # parts[2] = target_type (target node type)
-            role_type = parts[1]
-            target_type = parts[2]
-            return role_type, target_type
-        
-        return None
+        sanitized_properties = {}
+        for k, v in properties.items():
+            if _is_meaningful(v):
+                sanitized_properties[self._sanitize_property_name(k)] = v
+        return sanitized_properties
     
-    def _is_relation_property(self, property_name: str) -> bool:
+    def _parse_responsibilities(self, flattened_data: Dict[str, Any]) -> Dict[str, List[str]]:
         """
-        Check if a property represents a relation by looking for the pattern:
-        {asset_type_name}__{role_type}__{target_type}_Full Name
+        Parse responsibility data from flattened dictionary.
         
         Args:
-            property_name: Property name to check
+            flattened_data: Flattened asset data
             
         Returns:
-            bool: True if it's a relation property
-        """
-        # Check if it ends with "_Full Name" and has the double underscore pattern
-        if property_name.endswith("_Full Name"):
-            # Remove "_Full Name" and check if base has the relation pattern
-            base_property = property_name[:-10]  # Remove "_Full Name"
-            relation_info = self._extract_relation_info(base_property)
-            return relation_info is not None
-        return False
+            Dict with equally long 'names', 'roles' and 'emails' lists
+        """
+        return self._parse_responsibilities_fast(
+            flattened_data, _find_responsibility_keys(frozenset(flattened_data))
+        )
     
-    def _parse_responsibilities(self, flattened_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _parse_responsibilities_fast(self, flattened_data: Dict[str, Any], responsibility_keys: tuple) -> Dict[str, List[str]]:
         """
-        Parse responsibility data from flattened dictionary.
+        Parse responsibility data using responsibility keys that are already known.
+        
+        The result is column-oriented, so it can be shipped to Neo4j as UNWIND
+        parameters without repacking.
         
         Args:
             flattened_data: Flattened asset data
+            responsibility_keys: (user_name_key, user_role_key, user_email_key),
+                see _find_responsibility_keys
             
         Returns:
-            List of responsibility dictionaries
-        """
-        responsibilities = []
-        
-        # Find responsibility keys (case-insensitive)
-        user_name_key = None
-        user_role_key = None
-        user_email_key = None
-        
-        for key in flattened_data.keys():
-            key_lower = key.lower()
-            if 'user name against' in key_lower:
-                user_name_key = key
-            elif 'user role against' in key_lower:
-                user_role_key = key
-            elif 'user email against' in key_lower:
-                user_email_key = key
-        
-        if user_name_key and user_role_key and user_email_key:
-            names_str = flattened_data.get(user_name_key, '')
-            roles_str = flattened_data.get(user_role_key, '')
-            emails_str = flattened_data.get(user_email_key, '')
-            
-            # Handle None values
-            if names_str is None:
-                names_str = ''
-            if roles_str is None:
-                roles_str = ''
-            if emails_str is None:
-                emails_str = ''
-            
-            names = [name.strip() for name in str(names_str).split(',') if name.strip()]
-            roles = [role.strip() for role in str(roles_str).split(',') if role.strip()]
-            emails = [email.strip() for email in str(emails_str).split(',') if email.strip()]
-            
-            # Ensure all lists have the same length
-            max_len = max(len(names), len(roles), len(emails)) if any([names, roles, emails]) else 0
-            names.extend([''] * (max_len - len(names)))
-            roles.extend([''] * (max_len - len(roles)))
-            emails.extend([''] * (max_len - len(emails)))
-            
-            for name, role, email in zip(names, roles, emails):
-                if name.strip() or role.strip() or email.strip():
-                    responsibilities.append({
-                        'name': name.strip(),
-                        'role': role.strip(),
-                        'email': email.strip()
-                    })
-        
-        return responsibilities
-    
-    def _create_or_update_node(self, tx, node_name: str, node_label: str, properties: Dict[str, Any]):
-        """
-        Create or update a node in Neo4j.
-        
-        Args:
-            tx: Neo4j transaction
-            node_name: Name of the node (used as unique identifier)
-            node_label: Label for the node
-            properties: Properties to set on the node
+            Dict with equally long 'names', 'roles' and 'emails' lists; shorter
+            columns are padded with empty strings
         """
-        # Sanitize the label
-        sanitized_label = self._sanitize_property_name(node_label)
+        user_name_key, user_role_key, user_email_key = responsibility_keys
+        if not (user_name_key and user_role_key and user_email_key):
+            return {'names': [], 'roles': [], 'emails': []}
         
-        # Sanitize property names and filter out None/empty values
-        sanitized_properties = {}
-        for k, v in properties.items():
-            if v is not None and str(v).strip():
-                sanitized_key = self._sanitize_property_name(k)
-                sanitized_properties[sanitized_key] = v
+        names = _split_list_value(flattened_data.get(user_name_key))
+        roles = _split_list_value(flattened_data.get(user_role_key))
+        emails = _split_list_value(flattened_data.get(user_email_key))
         
-        # Always include the name property
-        sanitized_properties['name'] = node_name
+        # Ensure all lists have the same length
+        max_len = max(len(names), len(roles), len(emails))
+        names.extend([''] * (max_len - len(names)))
+        roles.extend([''] * (max_len - len(roles)))
+        emails.extend([''] * (max_len - len(emails)))
         
-        # Create or update node - only add new properties, don't overwrite existing ones
-        query = f"""
-        MERGE (n:{sanitized_label} {{name: $node_name}})
-        SET n += $properties
-        """
-        
-        try:
-            tx.run(query, node_name=node_name, properties=sanitized_properties)
-            logger.debug(f"Created/updated node: {node_name} with label: {sanitized_label}")
-        except Exception as e:
-            logger.error(f"Error creating/updating node {node_name}: {str(e)}")
-            raise
-    
-    def _create_relationship(self, tx, source_node: str, source_label: str, 
-                          target_node: str, target_label: str, relationship_type: str):
-        """
-        Create a relationship between two nodes if it doesn't already exist.
-        
-        Args:
-            tx: Neo4j transaction
-            source_node: Source node name
-            source_label: Source node label
-            target_node: Target node name
-            target_label: Target node label
-            relationship_type: Type of relationship
-        """
-        # Sanitize labels and relationship type
-        sanitized_source_label = self._sanitize_property_name(source_label)
-        sanitized_target_label = self._sanitize_property_name(target_label)
-        sanitized_rel_type = self._sanitize_property_name(relationship_type).upper()
-        
-        # First ensure both nodes exist
-        try:
-            # Create source node if it doesn't exist
-            tx.run(f"MERGE (n:{sanitized_source_label} {{name: $name}})", name=source_node)
-            # Create target node if it doesn't exist  
-            tx.run(f"MERGE (n:{sanitized_target_label} {{name: $name}})", name=target_node)
-        except Exception as e:
-            logger.warning(f"Could not ensure nodes exist: {str(e)}")
-        
-        # Create relationship if it doesn't exist
-        query = f"""
-        MATCH (source:{sanitized_source_label} {{name: $source_node}})
-        MATCH (target:{sanitized_target_label} {{name: $target_node}})
-        MERGE (source)-[r:{sanitized_rel_type}]->(target)
-        """
-        
-        try:
-            tx.run(query, source_node=source_node, target_node=target_node)
-            logger.debug(f"Created relationship: {source_node} -[{sanitized_rel_type}]-> {target_node}")
-        except Exception as e:
-            logger.warning(f"Could not create relationship {source_node} -[{sanitized_rel_type}]-> {target_node}: {str(e)}")
-    
-    def _create_user_relationships(self, tx, main_node_name: str, main_node_label: str, 
-                                 responsibilities: List[Dict[str, Any]]):
-        """
-        Create relationships between main node and user nodes based on responsibilities.
-        
-        Args:
-            tx: Neo4j transaction
-            main_node_name: Name of the main asset node
-            main_node_label: Label of the main asset node
-            responsibilities: List of responsibility data
-        """
-        for resp in responsibilities:
-            if resp['name']:
-                # Create or update user node
-                user_properties = {
-                    'name': resp['name']
-                }
-                if resp['email']:
-                    user_properties['email'] = resp['email']
-                
-                self._create_or_update_node(tx, resp['name'], 'User', user_properties)
-                
-                # Create relationship with role as relationship type
-                if resp['role']:
-                    self._create_relationship(
-                        tx, resp['name'], 'User',
-                        main_node_name, main_node_label, resp['role']
-                    )
+        return {'names': names, 'roles': roles, 'emails': emails}
     
     def export_to_neo4j(self, flattened_data: Dict[str, Any], asset_type_name: str) -> bool:
         """
@@ -371,99 +464,46 @@ class Neo4jExporter:
             bool: True if export successful, False otherwise
         """
         try:
-            with self.get_session() as session:
-                return session.execute_write(self._export_transaction, flattened_data, asset_type_name)
+            with self.batch_session() as session:
+                return self.export_to_neo4j_with_session(session, flattened_data, asset_type_name)
         except Exception as e:
             logger.error(f"Error exporting to Neo4j: {str(e)}")
             return False
     
-    def _export_transaction(self, tx, flattened_data: Dict[str, Any], asset_type_name: str) -> bool:
+    @contextmanager
+    def batch_session(self):
         """
-        Execute the export transaction.
+        Get a session to bind across many exports.
+        
+        Pass the session to export_to_neo4j_with_session for each asset, so the
+        exports share one pooled connection instead of acquiring one per asset.
+        
+        Yields:
+            Neo4j session
+        """
+        with self.get_session() as session:
+            yield session
+    
+    def export_to_neo4j_with_session(self, session, flattened_data: Dict[str, Any], asset_type_name: str) -> bool:
+        """
+        Export flattened data to Neo4j database on an existing session.
         
         Args:
-            tx: Neo4j transaction
-            flattened_data: Flattened asset data
-            asset_type_name: Asset type name
+            session: Neo4j session, e.g. from batch_session
+            flattened_data: Flattened asset data dictionary
+            asset_type_name: Name of the asset type
             
         Returns:
-            bool: True if successful
+            bool: True if export successful, False otherwise
         """
         try:
-            # Get the main node name (Full Name)
-            full_name_key = f"{asset_type_name} Full Name"
-            main_node_name = flattened_data.get(full_name_key)
-            
-            if not main_node_name:
-                logger.error(f"No full name found for asset type: {asset_type_name}")
-                return False
-            
-            # Separate properties and relations
-            node_properties = {}
-            relation_full_names = {}
-            
-            for key, value in flattened_data.items():
-                if value is None or str(value).strip() == '':
-                    continue
-                
-                # Skip responsibility properties - these should not be node properties
-                key_lower = key.lower()
-                if ('user name against' in key_lower or 
-                    'user role against' in key_lower or 
-                    'user email against' in key_lower):
-                    continue
-                
-                # Check if this is a relation property ending with "_Full Name"
-                if self._is_relation_property(key):
-                    # This contains the actual node names for the relation
-                    base_key = key[:-10]  # Remove "_Full Name"
-                    relation_full_names[base_key] = value
-                elif key.endswith(" Full Name") or key.endswith("_Full Name"):
-                    # This is a Full Name property but not a relation (like the main node's Full Name)
-                    continue
-                else:
-                    # Check if this property has a corresponding "_Full Name" property
-                    full_name_key_check = f"{key}_Full Name"
-                    if full_name_key_check in flattened_data:
-                        # This is a relation property, skip it (we'll use the Full Name version)
-                        continue
-                    else:
-                        # Regular node property
-                        node_properties[key] = value
-            
-            # Create or update the main node
-            self._create_or_update_node(tx, main_node_name, asset_type_name, node_properties)
-            
-            # Process relations
-            for relation_key, target_names_str in relation_full_names.items():
-                relation_info = self._extract_relation_info(relation_key)
-                if relation_info:
-                    role_type, target_node_type = relation_info
-                    
-                    if target_names_str:  # Only process if not None or empty
-                        # Split target names by comma and process each
-                        target_names = [name.strip() for name in str(target_names_str).split(',') if name.strip()]
-                        
-                        for target_name in target_names:
-                            # Create target node with minimal properties (just name)
-                            self._create_or_update_node(tx, target_name, target_node_type, {'name': target_name})
-                            
-                            # Create relationship from main node to target node
-                            self._create_relationship(
-                                tx, main_node_name, asset_type_name,
-                                target_name, target_node_type, role_type
-                            )
-            
-            # Process responsibilities (user relationships)
-            responsibilities = self._parse_responsibilities(flattened_data)
-            if responsibilities:
-                self._create_user_relationships(tx, main_node_name, asset_type_name, responsibilities)
-            
-            logger.info(f"Successfully exported {main_node_name} to Neo4j")
-            return True
-            
+            self.ensure_constraints(self._batch_labels([flattened_data], asset_type_name))
+            successful_exports, _ = session.execute_write(
+                self._export_batch_transaction, [flattened_data], asset_type_name
+            )
+            return successful_exports == 1
         except Exception as e:
-            logger.error(f"Error in export transaction: {str(e)}")
+            logger.error(f"Error exporting to Neo4j: {str(e)}")
             return False
     
     def export_batch_to_neo4j(self, flattened_batch: List[Dict[str, Any]], asset_type_name: str) -> tuple:
@@ -481,16 +521,120 @@ class Neo4jExporter:
             return 0, 0
             
         try:
+            self.ensure_constraints(self._batch_labels(flattened_batch, asset_type_name))
             with self.get_session() as session:
                 return session.execute_write(self._export_batch_transaction, flattened_batch, asset_type_name)
         except Exception as e:
             logger.error(f"Error exporting batch to Neo4j: {str(e)}")
             return 0, len(flattened_batch)
     
+    def export_batch_to_neo4j_parallel(self, flattened_batch: List[Dict[str, Any]], asset_type_name: str,
+                                       workers: int = 8, shard_size: int = 500) -> tuple:
+        """
+        Export a large batch as shards written concurrently on separate sessions.
+        
+        Each shard is its own transaction, so a deadlock between concurrent shards
+        only retries that shard (execute_write retries transient errors).
+        
+        Args:
+            flattened_batch: List of flattened asset data dictionaries
+            asset_type_name: Name of the asset type
+            workers: Maximum number of shards written at the same time
+            shard_size: Number of assets per shard
+            
+        Returns:
+            tuple: (successful_exports, failed_exports)
+        """
+        if len(flattened_batch) <= shard_size or workers <= 1:
+            return self.export_batch_to_neo4j(flattened_batch, asset_type_name)
+        
+        # Create constraints up front so the shards don't race to create them
+        try:
+            self.ensure_constraints(self._batch_labels(flattened_batch, asset_type_name))
+        except Exception as e:
+            logger.error(f"Error exporting batch to Neo4j: {str(e)}")
+            return 0, len(flattened_batch)
+        
+        shards = [flattened_batch[i:i + shard_size] for i in range(0, len(flattened_batch), shard_size)]
+        logger.info(f"Exporting {len(flattened_batch)} {asset_type_name} assets in {len(shards)} shards with {workers} workers")
+        
+        successful_exports = 0
+        failed_exports = 0
+        with ThreadPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+            for shard_success, shard_failed in executor.map(
+                lambda shard: self.export_batch_to_neo4j(shard, asset_type_name), shards
+            ):
+                successful_exports += shard_success
+                failed_exports += shard_failed
+        
+        increment_counter("neo4j_parallel_shards", len(shards))
+        return successful_exports, failed_exports
+    
+    def ensure_constraints(self, labels: Iterable[str]):
+        """
+        Ensure a uniqueness constraint on name exists for each label.
+        
+        The constraint gives every MERGE on {name: ...} an index seek instead of a
+        label scan. Each label is only handled once per exporter.
+        
+        Args:
+            labels: Sanitized node labels
+        """
+        missing = [label for label in labels if label and label not in self._constraints_created]
+        if not missing:
+            return
+        
+        with self.get_session() as session:
+            for label in missing:
+                try:
+                    session.run(
+                        f"CREATE CONSTRAINT IF NOT EXISTS FOR (n:{label}) REQUIRE n.name IS UNIQUE"
+                    ).consume()
+                    increment_counter("neo4j_constraints_ensured")
+                    logger.debug(f"Ensured uniqueness constraint on {label}.name")
+                except Exception as e:
+                    # E.g. existing duplicate names; MERGE still works, only slower
+                    logger.warning(f"Could not create uniqueness constraint on {label}.name: {str(e)}")
+                self._constraints_created.add(label)
+    
+    def _batch_labels(self, flattened_batch: List[Dict[str, Any]], asset_type_name: str) -> set:
+        """
+        Collect the sanitized labels of all nodes a batch export will write.
+        
+        Args:
+            flattened_batch: List of flattened asset data dictionaries
+            asset_type_name: Name of the asset type
+            
+        Returns:
+            set: Sanitized node labels
+        """
+        labels = {self._sanitize_property_name(asset_type_name)}
+        plan_keys = None
+        
+        for flattened_data in flattened_batch:
+            if plan_keys is not None and flattened_data.keys() == plan_keys:
+                continue
+            plan_keys = frozenset(flattened_data)
+            plan = _build_key_plan(plan_keys)
+            
+            for _, target_node_type in plan['relation_keys'].values():
+                labels.add(self._sanitize_property_name(target_node_type))
+            if plan['resp_keys']:
+                labels.add('User')
+        
+        return labels
+    
+    @unit_of_work(timeout=300)
     def _export_batch_transaction(self, tx, flattened_batch: List[Dict[str, Any]], asset_type_name: str) -> tuple:
         """
         Execute the batch export transaction.
         
+        All nodes and relationships of the batch are collected first and then written
+        with one UNWIND query per label of main and user nodes and one per
+        relationship kind, which also creates the relation targets, instead of
+        several queries per asset. Single-asset exports use it with a one-element
+        batch. On transient errors execute_write retries the whole batch.
+        
         Args:
             tx: Neo4j transaction
             flattened_batch: List of flattened asset data
@@ -504,113 +648,176 @@ class Neo4jExporter:
         
         logger.info(f"Starting batch export of {len(flattened_batch)} assets for {asset_type_name}")
         
+        # Sanitized label -> {node name: properties}, for main and user nodes
+        node_rows = defaultdict(dict)
+        # (source label, target label, relationship type) -> {(source name, target name)}
+        relationship_rows = defaultdict(set)
+        
+        # Assets of a type normally share one key set, so the plan is only
+        # rebuilt when an asset's keys differ from the previous one's
+        plan = None
+        plan_keys = None
+        
         for idx, flattened_data in enumerate(flattened_batch, 1):
             try:
-                if self._export_single_asset_in_transaction(tx, flattened_data, asset_type_name):
+                if plan is None or flattened_data.keys() != plan_keys:
+                    plan_keys = frozenset(flattened_data)
+                    plan = _build_key_plan(plan_keys)
+                
+                if self._collect_asset_rows(flattened_data, asset_type_name, plan, node_rows, relationship_rows):
                     successful_exports += 1
-                    logger.debug(f"[{idx}/{len(flattened_batch)}] Successfully exported asset in batch")
+                    logger.debug(f"[{idx}/{len(flattened_batch)}] Collected asset for batch export")
                 else:
                     failed_exports += 1
-                    logger.debug(f"[{idx}/{len(flattened_batch)}] Failed to export asset in batch")
+                    logger.debug(f"[{idx}/{len(flattened_batch)}] Failed to collect asset for batch export")
             except Exception as e:
                 failed_exports += 1
                 logger.error(f"[{idx}/{len(flattened_batch)}] Error in batch export: {str(e)}")
         
+        # Nodes with properties first, so the relationship queries can MATCH their sources.
+        # Concurrent batches MERGE shared User and relation target nodes, so labels,
+        # kinds and rows are written in sorted order: every transaction then takes
+        # its node locks in the same order and they cannot deadlock each other
+        for label in sorted(node_rows):
+            rows = node_rows[label]
+            tx.run(
+                self._node_merge_query(label),
+                rows=[{'name': name, 'properties': rows[name]} for name in sorted(rows)]
+            )
+            increment_counter("neo4j_unwind_queries")
+        
+        for relationship_kind in sorted(relationship_rows):
+            tx.run(
+                self._relationship_merge_query(relationship_kind),
+                rows=[{'source': source, 'target': target}
+                      for source, target in sorted(relationship_rows[relationship_kind])]
+            )
+            increment_counter("neo4j_unwind_queries")
+        
         logger.info(f"Batch export completed - Success: {successful_exports}, Failed: {failed_exports}")
         return successful_exports, failed_exports
     
-    def _export_single_asset_in_transaction(self, tx, flattened_data: Dict[str, Any], asset_type_name: str) -> bool:
+    def _node_merge_query(self, label: str) -> str:
         """
-        Export a single asset within an existing transaction.
+        Get the UNWIND node MERGE query for a sanitized label.
+        
+        Query texts are built once per label, so every batch sends identical
+        text and the server reuses its cached plan.
         
         Args:
-            tx: Neo4j transaction
-            flattened_data: Flattened asset data
-            asset_type_name: Asset type name
+            label: Sanitized node label
             
         Returns:
-            bool: True if successful
+            str: Cypher query taking $rows of {name, properties}
+        """
+        query = self._node_merge_query_cache.get(label)
+        if query is None:
+            query = (
+                f"UNWIND $rows AS row "
+                f"MERGE (n:{label} {{name: row.name}}) "
+                f"SET n += row.properties"
+            )
+            self._node_merge_query_cache[label] = query
+        return query
+    
+    def _relationship_merge_query(self, relationship_kind: tuple) -> str:
         """
-        try:
-            # Get the main node name (Full Name)
-            full_name_key = f"{asset_type_name} Full Name"
-            main_node_name = flattened_data.get(full_name_key)
-            
-            if not main_node_name:
-                logger.error(f"No full name found for asset type: {asset_type_name}")
-                return False
-            
-            # Separate properties and relations
-            node_properties = {}
-            relation_full_names = {}
-            
-            for key, value in flattened_data.items():
-                if value is None or str(value).strip() == '':
-                    continue
-                
-                # Skip responsibility properties - these should not be node properties
-                key_lower = key.lower()
-                if ('user name against' in key_lower or 
-                    'user role against' in key_lower or 
-                    'user email against' in key_lower):
-                    continue
-                
-                # Check if this is a relation property ending with "_Full Name"
-                if self._is_relation_property(key):
-                    # This contains the actual node names for the relation
-                    base_key = key[:-10]  # Remove "_Full Name"
-                    relation_full_names[base_key] = value
-                elif key.endswith(" Full Name") or key.endswith("_Full Name"):
-                    # This is a Full Name property but not a relation (like the main node's Full Name)
-                    continue
-                else:
-                    # Check if this property has a corresponding "_Full Name" property
-                    full_name_key_check = f"{key}_Full Name"
-                    if full_name_key_check in flattened_data:
-                        # This is a relation property, skip it (we'll use the Full Name version)
-                        continue
-                    else:
-                        # Regular node property
-                        node_properties[key] = value
-            
-            # Create or update the main node
-            self._create_or_update_node(tx, main_node_name, asset_type_name, node_properties)
-            
-            # Process relations
-            for relation_key, target_names_str in relation_full_names.items():
-                relation_info = self._extract_relation_info(relation_key)
-                if relation_info:
-                    role_type, target_node_type = relation_info
-                    
-                    if target_names_str:  # Only process if not None or empty
-                        # Split target names by comma and process each
-                        target_names = [name.strip() for name in str(target_names_str).split(',') if name.strip()]
-                        
-                        for target_name in target_names:
-                            # Create target node with minimal properties (just name)
-                            self._create_or_update_node(tx, target_name, target_node_type, {'name': target_name})
-                            
-                            # Create relationship from main node to target node
-                            self._create_relationship(
-                                tx, main_node_name, asset_type_name,
-                                target_name, target_node_type, role_type
-                            )
-            
-            # Process responsibilities (user relationships)
-            responsibilities = self._parse_responsibilities(flattened_data)
-            if responsibilities:
-                self._create_user_relationships(tx, main_node_name, asset_type_name, responsibilities)
+        Get the UNWIND relationship MERGE query for a relationship kind.
+        
+        The source node must already exist; the target node is MERGEd in the
+        same query, so relation targets need no node query of their own.
+        
+        Args:
+            relationship_kind: Sanitized (source label, target label, relationship type)
             
-            return True
+        Returns:
+            str: Cypher query taking $rows of {source, target}
+        """
+        query = self._relationship_query_cache.get(relationship_kind)
+        if query is None:
+            source_label, target_label, relationship_type = relationship_kind
+            query = (
+                f"UNWIND $rows AS row "
+                f"MATCH (source:{source_label} {{name: row.source}}) "
+                f"MERGE (target:{target_label} {{name: row.target}}) "
+                f"MERGE (source)-[r:{relationship_type}]->(target)"
+            )
+            self._relationship_query_cache[relationship_kind] = query
+        return query
+    
+    def _collect_asset_rows(self, flattened_data: Dict[str, Any], asset_type_name: str,
+                            plan: Dict[str, Any],
+                            node_rows: Dict[str, Dict[str, Dict[str, Any]]],
+                            relationship_rows: Dict[tuple, set]) -> bool:
+        """
+        Collect the nodes and relationships of a single asset for a batch write.
+        
+        Args:
+            flattened_data: Flattened asset data
+            asset_type_name: Asset type name
+            plan: Key plan for the asset's keys, see _build_key_plan
+            node_rows: Node properties by sanitized label and node name, updated in place
+            relationship_rows: (source, target) name pairs by sanitized
+                (source label, target label, relationship type), updated in place
             
-        except Exception as e:
-            logger.error(f"Error in single asset export transaction: {str(e)}")
+        Returns:
+            bool: True if the asset could be collected
+        """
+        # Get the main node name (Full Name)
+        full_name_key = f"{asset_type_name} Full Name"
+        main_node_name = flattened_data.get(full_name_key)
+        
+        if not main_node_name:
+            logger.error(f"No full name found for asset type: {asset_type_name}")
             return False
+        
+        node_properties = _plan_properties(plan, flattened_data)
+        
+        main_label = self._sanitize_property_name(asset_type_name)
+        properties = self._sanitize_properties(node_properties)
+        properties['name'] = main_node_name
+        node_rows[main_label].setdefault(main_node_name, {}).update(properties)
+        
+        # Process relations
+        for relation_key, (role_type, target_node_type) in plan['relation_keys'].items():
+            target_names_str = flattened_data[relation_key]
+            if not target_names_str or not _is_meaningful(target_names_str):
+                continue
+            
+            target_label = self._sanitize_property_name(target_node_type)
+            rel_type = self._sanitize_property_name(role_type).upper()
+            targets = relationship_rows[(main_label, target_label, rel_type)]
+            
+            # Split target names by comma and process each
+            for target_name in str(target_names_str).split(','):
+                target_name = target_name.strip()
+                if target_name:
+                    # The target node is MERGEd by the relationship query itself
+                    targets.add((main_node_name, target_name))
+        
+        # Process responsibilities (user relationships); users are written with
+        # one UNWIND per label and their relationships with one per role
+        responsibilities = self._parse_responsibilities_fast(flattened_data, plan['responsibility_keys'])
+        for name, role, email in zip(responsibilities['names'], responsibilities['roles'], responsibilities['emails']):
+            if name:
+                user_properties = node_rows['User'].setdefault(name, {})
+                user_properties['name'] = name
+                if email:
+                    user_properties['email'] = email
+                
+                if role:
+                    rel_type = self._sanitize_property_name(role).upper()
+                    relationship_rows[('User', main_label, rel_type)].add((name, main_node_name))
+        
+        return True
 
     def test_connection(self) -> bool:
         """
         Test the Neo4j database connection.
         
+        Runs a query on every call; exports rely on the pool's one-time
+        verify_connectivity check instead.
+        
         Returns:
             bool: True if connection successful
         """
@@ -623,21 +830,26 @@ class Neo4jExporter:
             return False
 
 
+@lru_cache(maxsize=1)
 def create_neo4j_exporter_from_env() -> Neo4jExporter:
     """
     Create Neo4j exporter instance from environment variables.
     
+    The exporter is created once per process and shared; the connection
+    pool owns the driver lifecycle.
+    
     Returns:
         Neo4jExporter: Configured exporter instance
     """
-    load_dotenv()
-    
     uri = os.getenv('NEO4J_URI', 'bolt://localhost:7687')
     username = os.getenv('NEO4J_USERNAME', 'neo4j')
     password = os.getenv('NEO4J_PASSWORD', 'password')
     database = os.getenv('NEO4J_DATABASE', 'neo4j')
     
-    return Neo4jExporter(uri, username, password, database)
+    exporter = Neo4jExporter(uri, username, password, database)
+    # Checked once per driver rather than before every export
+    exporter.pool.verify_connectivity(exporter.driver)
+    return exporter
 
 
 # Example usage and integration with existing code
@@ -653,14 +865,11 @@ def export_flattened_data_to_neo4j(flattened_data: Dict[str, Any], asset_type_na
         bool: True if export successful
     """
     try:
-        with create_neo4j_exporter_from_env() as exporter:
-            # Test connection first
-            if not exporter.test_connection():
-                logger.error("Failed to connect to Neo4j database")
-                return False
-            
-            # Export the data
-            return exporter.export_to_neo4j(flattened_data, asset_type_name)
+        exporter = create_neo4j_exporter_from_env()
+        
+        # Export the data
+        with exporter.batch_session() as session:
+            return exporter.export_to_neo4j_with_session(session, flattened_data, asset_type_name)
             
     except Exception as e:
         logger.error(f"Error exporting to Neo4j: {str(e)}")
@@ -682,14 +891,10 @@ def export_batch_to_neo4j(flattened_batch: List[Dict[str, Any]], asset_type_name
         return 0, 0
         
     try:
-        with create_neo4j_exporter_from_env() as exporter:
-            # Test connection first
-            if not exporter.test_connection():
-                logger.error("Failed to connect to Neo4j database")
-                return 0, len(flattened_batch)
-            
-            # Export the batch
-            return exporter.export_batch_to_neo4j(flattened_batch, asset_type_name)
+        exporter = create_neo4j_exporter_from_env()
+        
+        # Export the batch
+        return exporter.export_batch_to_neo4j(flattened_batch, asset_type_name)
             
     except Exception as e:
         logger.error(f"Error exporting batch to Neo4j: {str(e)}")
@@ -4,11 +4,68 @@ Data Transformer Module
 This module provides functionality for transforming Collibra data structures.
 """
 
-from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# How each attribute category is flattened, in output order: the field holding the
+# value, and whether it is a list to join, a string to deduplicate or a plain value
+_JOIN, _DEDUP, _ASSIGN = 0, 1, 2
+_ATTR_HANDLERS = {
+    'multiValueAttributes': ('stringValues', _JOIN),
+    'stringAttributes': ('stringValue', _DEDUP),
+    'numericAttributes': ('numericValue', _ASSIGN),
+    'dateAttributes': ('dateValue', _ASSIGN),
+    'booleanAttributes': ('booleanValue', _ASSIGN),
+}
+
+def _build_relations(outgoing: List[dict], incoming: List[dict],
+                     relation_prefix: str) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """
+    Group the related assets of an asset by relation type.
+    
+    Args:
+        outgoing: The asset's outgoingRelations
+        incoming: The asset's incomingRelations
+        relation_prefix: The asset type name followed by '__'
+        
+    Returns:
+        tuple: (display names, full names), each keyed by relation type
+    """
+    relation_types = {}
+    relation_ids = {}
+    # Outgoing relations are keyed by role and target, incoming ones by corole
+    # and source; each direction has its own loop so nothing is re-decided per relation
+    for relation in outgoing:
+        related = relation['target']
+        display_name = related.get('displayName', '')
+        if display_name:
+            rel_type = "%s%s__%s" % (relation_prefix, relation['type'].get('role', ''), related['type']['name'])
+            names = relation_types.get(rel_type)
+            if names is None:
+                relation_types[rel_type] = [display_name.strip()]
+                relation_ids[rel_type] = [related.get('fullName', '')]
+            else:
+                names.append(display_name.strip())
+                relation_ids[rel_type].append(related.get('fullName', ''))
+    
+    for relation in incoming:
+        related = relation['source']
+        display_name = related.get('displayName', '')
+        if display_name:
+            rel_type = "%s%s__%s" % (relation_prefix, relation['type'].get('corole', ''), related['type']['name'])
+            names = relation_types.get(rel_type)
+            if names is None:
+                relation_types[rel_type] = [display_name.strip()]
+                relation_ids[rel_type] = [related.get('fullName', '')]
+            else:
+                names.append(display_name.strip())
+                relation_ids[rel_type].append(related.get('fullName', ''))
+    
+    return relation_types, relation_ids
+
 def flatten_json(asset, asset_type_name):
     """
     Flatten a nested asset JSON structure into a flat dictionary.
@@ -20,71 +77,98 @@ def flatten_json(asset, asset_type_name):
     Returns:
         dict: A flattened dictionary representation of the asset
     """
-    flattened = {
-        f"{asset_type_name} Full Name": asset['fullName'],
-        f"Display Name": asset['displayName'],
-        "Asset Type": asset['type']['name'],
-        "Status": asset['status']['name'],
-        f"Domain": asset['domain']['name'],
-        f"Community": asset['domain']['parent']['name'] if asset['domain']['parent'] else None,
-        f"Last Modified On": asset['modifiedOn'],
-        f"Last Modified By": asset['modifiedBy']['fullName'],
-        f"Created On": asset['createdOn'],
-        f"Created By": asset['createdBy']['fullName'],
-    }
-
-    responsibilities = asset.get('responsibilities', [])
-    if responsibilities:
-        flattened[f"User Role Against {asset_type_name}"] = ', '.join(r['role']['name'] for r in responsibilities if 'role' in r)
-        flattened[f"User Name Against {asset_type_name}"] = ', '.join(r['user']['fullName'] for r in responsibilities if 'user' in r)
-        flattened[f"User Email Against {asset_type_name}"] = ', '.join(r['user']['email'] for r in responsibilities if 'user' in r)
-
-    # Temporary storage for string attributes
-    string_attrs = defaultdict(list)
-
-    for attr_type in ['multiValueAttributes', 'stringAttributes', 'numericAttributes', 'dateAttributes', 'booleanAttributes']:
-        for attr in asset.get(attr_type, []):
-            attr_name = attr['type']['name']
-            if attr_type == 'multiValueAttributes':
-                flattened[attr_name] = ', '.join(attr['stringValues'])
-            elif attr_type == 'stringAttributes':
+    return make_flattener(asset_type_name)(asset)
+
+@lru_cache(maxsize=256)
+def make_flattener(asset_type_name):
+    """
+    Build a flatten function specialized for one asset type.
+    
+    The keys that depend on the asset type name are formatted once here
+    instead of for every asset.
+    
+    Args:
+        asset_type_name: The name of the asset type
+        
+    Returns:
+        callable: flatten(asset) returning the same dictionary as flatten_json
+    """
+    full_name_key = f"{asset_type_name} Full Name"
+    user_role_key = f"User Role Against {asset_type_name}"
+    user_name_key = f"User Name Against {asset_type_name}"
+    user_email_key = f"User Email Against {asset_type_name}"
+    relation_prefix = f"{asset_type_name}__"
+
+    def flatten(asset):
+        domain = asset['domain']
+        flattened = {
+            full_name_key: asset['fullName'],
+            "Display Name": asset['displayName'],
+            "Asset Type": asset['type']['name'],
+            "Status": asset['status']['name'],
+            "Domain": domain['name'],
+            "Community": domain['parent']['name'] if domain['parent'] else None,
+            "Last Modified On": asset['modifiedOn'],
+            "Last Modified By": asset['modifiedBy']['fullName'],
+            "Created On": asset['createdOn'],
+            "Created By": asset['createdBy']['fullName'],
+        }
+
+        responsibilities = asset.get('responsibilities', [])
+        if responsibilities:
+            flattened[user_role_key] = ', '.join(r['role']['name'] for r in responsibilities if 'role' in r)
+            flattened[user_name_key] = ', '.join(r['user']['fullName'] for r in responsibilities if 'user' in r)
+            flattened[user_email_key] = ', '.join(r['user']['email'] for r in responsibilities if 'user' in r)
+
+        # Temporary storage for string attributes
+        string_attrs = {}
+
+        for attr_type, (value_key, handling) in _ATTR_HANDLERS.items():
+            attrs = asset.get(attr_type)
+            if not attrs:
+                continue
+            if handling == _ASSIGN:
+                for attr in attrs:
+                    flattened[attr['type']['name']] = attr[value_key]
+            elif handling == _DEDUP:
                 # Collect string attributes
-                string_attrs[attr_name].append(attr['stringValue'].strip())
+                for attr in attrs:
+                    attr_name = attr['type']['name']
+                    values = string_attrs.get(attr_name)
+                    if values is None:
+                        string_attrs[attr_name] = [attr[value_key].strip()]
+                    else:
+                        values.append(attr[value_key].strip())
             else:
-                value_key = f"{attr_type[:-10]}Value"
-                flattened[attr_name] = attr[value_key]
-
-    # Process collected string attributes
-    for attr_name, values in string_attrs.items():
-        if len(set(values)) > 1:
-            flattened[attr_name] = ', '.join(set(values))
-        else:
-            flattened[attr_name] = values[0]
-
-    relation_types = defaultdict(list)
-    relation_ids = defaultdict(list)
-    for relation_direction in ['outgoingRelations', 'incomingRelations']:
-        for relation in asset.get(relation_direction, []):
-            role_or_corole = 'role' if relation_direction == 'outgoingRelations' else 'corole'
-            role_type = relation['type'].get(role_or_corole, '')
-            target_or_source = 'target' if relation_direction == 'outgoingRelations' else 'source'
-            
-            if relation_direction == 'outgoingRelations':
-                rel_type = f"{asset_type_name}__{role_type}__{relation[target_or_source]['type']['name']}"
-            else:
-                rel_type = f"{asset_type_name}__{role_type}__{relation[target_or_source]['type']['name']}"
-            
-            display_name = relation[target_or_source].get('displayName', '')
-            asset_id = relation[target_or_source].get('fullName', '')
-            
-            if display_name:
-                relation_types[rel_type].append(display_name.strip())
-                relation_ids[rel_type].append(asset_id)
-
-    # Update flattened with relation names and their IDs
-    for rel_type, values in relation_types.items():
-        flattened[rel_type] = ', '.join(values)
-        flattened[f"{rel_type}_Full Name"] = ', '.join(str(id) for id in relation_ids[rel_type])
-
-    return flattened
+                for attr in attrs:
+                    flattened[attr['type']['name']] = ', '.join(attr[value_key])
+
+        # Process collected string attributes
+        for attr_name, values in string_attrs.items():
+            if len(values) == 1:
+                flattened[attr_name] = values[0]
+                continue
+            # Drop repeated values, keeping the first occurrence of each
+            seen = set()
+            unique_values = []
+            for value in values:
+                if value not in seen:
+                    seen.add(value)
+                    unique_values.append(value)
+            flattened[attr_name] = unique_values[0] if len(unique_values) == 1 else ', '.join(unique_values)
+
+        relation_types, relation_ids = _build_relations(
+            asset.get('outgoingRelations', ()),
+            asset.get('incomingRelations', ()),
+            relation_prefix
+        )
+
+        # Update flattened with relation names and their IDs
+        for rel_type, values in relation_types.items():
+            flattened[rel_type] = ', '.join(values)
+            # fullName values are already strings
+            flattened[rel_type + '_Full Name'] = ', '.join(relation_ids[rel_type])
+
+        return flattened
 
+    return flatten
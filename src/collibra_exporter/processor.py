@@ -6,143 +6,291 @@ This module provides the core functionality for processing Collibra assets and e
 
 import os
 import time
+import atexit
+import queue
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from .api import fetch_data, fetch_nested_data
+import threading
+from collections import deque
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from .api import fetch_data, fetch_nested_data, fetch_nested_data_bulk
 from .utils import get_asset_type_name
-from .models import flatten_json
-from .models.exporter import export_flattened_data_to_neo4j, export_batch_to_neo4j
+from .models import make_flattener
+from .models.exporter import export_batch_to_neo4j
 
 logger = logging.getLogger(__name__)
 
-def process_data(base_url, asset_type_id, limit=94, initial_nested_limit=50):
+# Nested fields that are truncated at the initial nested limit in the first query
+_NESTED_FIELDS = (
+    'stringAttributes',
+    'multiValueAttributes',
+    'numericAttributes',
+    'dateAttributes',
+    'booleanAttributes',
+    'outgoingRelations',
+    'incomingRelations',
+    'responsibilities'
+)
+_NESTED_FIELDS_SET = frozenset(_NESTED_FIELDS)
+
+# Nested items requested per field in the first query. One extra item is always
+# requested, so a field is known to be truncated only when it returns more than this
+INITIAL_NESTED_LIMIT = int(os.getenv('INITIAL_NESTED_LIMIT', '50'))
+
+# Upper bound for the per-field initial limits learned from earlier pages; set it
+# to INITIAL_NESTED_LIMIT to always request the fixed limit
+MAX_INITIAL_NESTED_LIMIT = int(os.getenv('MAX_INITIAL_NESTED_LIMIT', '800'))
+
+# Recent item counts kept per nested field to estimate its 95th percentile
+_NESTED_SIZE_SAMPLES = 1000
+
+# Maximum number of concurrent full fetches of truncated nested fields, shared by
+# all asset types being processed
+NESTED_FETCH_WORKERS = int(os.getenv('NESTED_FETCH_WORKERS', '32'))
+
+# Assets whose truncated fields are fetched together in one aliased query
+NESTED_BULK_ASSETS = int(os.getenv('NESTED_BULK_ASSETS', '10'))
+
+_nested_fetch_executor = None
+_nested_fetch_executor_lock = threading.Lock()
+
+def _get_nested_fetch_executor():
+    """Create the nested fetch thread pool on first use."""
+    global _nested_fetch_executor
+    with _nested_fetch_executor_lock:
+        if _nested_fetch_executor is None:
+            _nested_fetch_executor = ThreadPoolExecutor(
+                max_workers=NESTED_FETCH_WORKERS,
+                thread_name_prefix="NestedFetch"
+            )
+            atexit.register(_nested_fetch_executor.shutdown)
+    return _nested_fetch_executor
+
+# Asset types processed concurrently by process_all_asset_types. Nested-field fetches
+# are bounded by the shared nested fetch pool, so each extra asset type only adds one
+# in-flight page request and its Neo4j writer threads
+ASSET_TYPE_WORKERS = int(os.getenv('ASSET_TYPE_WORKERS', '10'))
+
+# Flattened assets sent to Neo4j per UNWIND batch; each batch is written in
+# one transaction, so larger batches mean fewer round trips and commits
+EXPORT_BATCH_SIZE = int(os.getenv('NEO4J_EXPORT_BATCH_SIZE', '5000'))
+
+# Flattened batches that may wait for the Neo4j writers of an asset type
+EXPORT_QUEUE_SIZE = 4
+
+# Threads writing the batches of one asset type to Neo4j concurrently, each in its
+# own session; all writers of all asset types share the driver's connection pool
+# (NEO4J_MAX_CONNECTION_POOL_SIZE). Asset types already write concurrently
+# (ASSET_TYPE_WORKERS), and concurrent transactions MERGE the same User and
+# relation target nodes, so more writers mean more lock waits and retries
+NEO4J_WRITER_THREADS = int(os.getenv('NEO4J_WRITER_THREADS', '1'))
+
+# Worker processes used to flatten assets; 0 flattens in the calling thread
+FLATTEN_PROCESSES = int(os.getenv('FLATTEN_PROCESSES', '0'))
+
+_flatten_pool = None
+_flatten_pool_lock = threading.Lock()
+
+def _get_flatten_pool():
+    """Create the flatten process pool on first use, shared by all asset types."""
+    global _flatten_pool
+    with _flatten_pool_lock:
+        if _flatten_pool is None:
+            _flatten_pool = ProcessPoolExecutor(max_workers=FLATTEN_PROCESSES)
+            atexit.register(_flatten_pool.shutdown)
+    return _flatten_pool
+
+def _flatten_asset(asset, asset_type_name):
     """
-    Process assets with optimized nested field handling.
+    Flatten one asset, capturing the error instead of raising it.
+    
+    Defined at module level so it can be sent to the flatten process pool.
     
     Args:
-        base_url: The base URL of the Collibra instance
-        asset_type_id: The ID of the asset type to process
-        limit: Maximum number of assets to fetch per batch
-        initial_nested_limit: Initial limit for nested fields
+        asset: The asset to flatten
+        asset_type_name: The name of the asset type
         
     Returns:
-        list: A list of processed assets
+        tuple: (flattened asset, None) on success, (None, error message) on failure
     """
-    asset_type_name = get_asset_type_name(asset_type_id)
-    logger.info("="*60)
-    logger.info(f"Starting data processing for asset type: {asset_type_name} (ID: {asset_type_id})")
-    logger.info(f"Configuration - Batch Size: {limit}, Initial Nested Limit: {initial_nested_limit}")
-    logger.info("="*60)
-    
-    all_assets = []
-    paginate = None
-    batch_count = 0
-    start_time = time.time()
+    try:
+        return make_flattener(asset_type_name)(asset), None
+    except Exception as e:
+        return None, str(e)
 
-    while True:
-        batch_count += 1
-        batch_start_time = time.time()
-        logger.info(f"\n[Batch {batch_count}] Starting new batch for {asset_type_name}")
-        logger.debug(f"[Batch {batch_count}] Pagination token: {paginate}")
-        
-        # Get initial batch with small nested limits
-        initial_response = fetch_data(
-            base_url,
-            asset_type_id, 
-            paginate, 
-            limit, 
-            0, 
-            initial_nested_limit
-        )
+def _flatten_batch(assets, asset_type_name):
+    """
+    Flatten a batch of assets for export to Neo4j.
+    
+    Flattening runs in the flatten process pool when FLATTEN_PROCESSES is set,
+    so that it is not serialized by the GIL.
+    
+    Args:
+        assets: The assets to flatten
+        asset_type_name: The name of the asset type
         
-        if not initial_response or 'data' not in initial_response or 'assets' not in initial_response['data']:
-            logger.error(f"[Batch {batch_count}] Failed to fetch initial data")
-            break
+    Returns:
+        tuple: (flattened_batch, failed_flattens)
+    """
+    flatten = partial(_flatten_asset, asset_type_name=asset_type_name)
+    if FLATTEN_PROCESSES > 0:
+        results = _get_flatten_pool().map(flatten, assets, chunksize=64)
+    else:
+        results = map(flatten, assets)
+    
+    flattened_batch = []
+    failed_flattens = 0
+    for flattened_asset, error in results:
+        if error is None:
+            flattened_batch.append(flattened_asset)
+        else:
+            failed_flattens += 1
+            logger.error(f"Error flattening asset: {error}")
+    return flattened_batch, failed_flattens
 
-        current_assets = initial_response['data']['assets']
-        if not current_assets:
-            logger.info(f"[Batch {batch_count}] No more assets to fetch")
+def _export_worker(export_queue, results_queue, asset_type_name):
+    """
+    Export flattened batches to Neo4j until a None batch is received.
+    
+    Args:
+        export_queue: Queue of flattened batches to export
+        results_queue: Queue receiving (successful_exports, failed_exports) per batch
+        asset_type_name: The name of the asset type
+    """
+    while True:
+        flattened_batch = export_queue.get()
+        if flattened_batch is None:
             break
+        try:
+            batch_success, batch_failed = export_batch_to_neo4j(flattened_batch, asset_type_name)
+        except Exception as e:
+            logger.error(f"Error exporting batch for {asset_type_name}: {str(e)}")
+            batch_success, batch_failed = 0, len(flattened_batch)
+        results_queue.put((batch_success, batch_failed))
+        logger.info(f"Batch completed - Success: {batch_success}, Failed: {batch_failed}")
 
-        logger.info(f"[Batch {batch_count}] Processing {len(current_assets)} assets")
-
-        # Process each asset
-        processed_assets = []
-        for asset_idx, asset in enumerate(current_assets, 1):
-            asset_id = asset['id']
-            asset_name = asset.get('displayName', 'Unknown Name')
-            logger.info(f"\n[Batch {batch_count}][Asset {asset_idx}/{len(current_assets)}] Processing: {asset_name}")
-            
-            complete_asset = asset.copy()
-            
-            # Define nested fields to check
-            nested_fields = [
-                'stringAttributes',
-                'multiValueAttributes',
-                'numericAttributes',
-                'dateAttributes',
-                'booleanAttributes',
-                'outgoingRelations',
-                'incomingRelations',
-                'responsibilities'
-            ]
-
-            # Check each nested field
-            for field in nested_fields:
-                if field not in asset:
-                    continue
-                    
-                initial_data = asset[field]
-                
-                # If we hit the initial limit, fetch all data in one big query
-                if len(initial_data) == initial_nested_limit:
-                    logger.info(f"[Batch {batch_count}][Asset {asset_idx}][{field}] Requires full fetch")
-                    
-                    complete_data = fetch_nested_data(
-                        base_url,
-                        asset_type_id,
-                        asset_id,
-                        field
-                    )
-                    
-                    if complete_data:
-                        complete_asset[field] = complete_data
-                        logger.info(f"[Batch {batch_count}][Asset {asset_idx}][{field}] "
-                                  f"Retrieved {len(complete_data)} items")
-                    else:
-                        logger.warning(f"[Batch {batch_count}][Asset {asset_idx}][{field}] "
-                                     f"Failed to fetch complete data, using initial data")
-                        complete_asset[field] = initial_data
-                else:
-                    complete_asset[field] = initial_data
-
-            processed_assets.append(complete_asset)
-            logger.info(f"[Batch {batch_count}][Asset {asset_idx}] Completed processing")
+def _adaptive_field_limits(field_sizes, initial_nested_limit):
+    """
+    Choose per-field initial nested limits from the sizes seen on earlier pages.
+    
+    A field whose 95th-percentile size exceeds the initial limit gets the
+    initial limit doubled until it covers that size, up to
+    MAX_INITIAL_NESTED_LIMIT, so fields that usually overflow come back
+    complete in the page query. Doubling keeps the number of distinct
+    queries (and cache keys) small.
+    
+    Args:
+        field_sizes: Recent item counts per nested field
+        initial_nested_limit: Initial limit for nested fields
+        
+    Returns:
+        dict: Initial limit per field, only for fields whose limit was raised
+    """
+    field_limits = {}
+    for field, sizes in field_sizes.items():
+        if not sizes:
+            continue
+        p95 = sorted(sizes)[int(len(sizes) * 0.95)]
+        field_limit = max(initial_nested_limit, 1)
+        while field_limit < p95 and field_limit < MAX_INITIAL_NESTED_LIMIT:
+            field_limit *= 2
+        field_limit = min(field_limit, MAX_INITIAL_NESTED_LIMIT)
+        if field_limit > initial_nested_limit:
+            field_limits[field] = field_limit
+    return field_limits
 
-        all_assets.extend(processed_assets)
+def _fetch_overflow_fields(base_url, asset_type_id, assets, initial_nested_limit, field_limits=None):
+    """
+    Fetch the complete data of every nested field that exceeded the initial limit.
+    
+    The truncated fields of a page are fetched with aliased bulk queries of up
+    to NESTED_BULK_ASSETS assets each, so a page costs a few round trips rather
+    than one per field; the bulk queries run concurrently on the shared nested
+    fetch pool.
+    
+    Args:
+        base_url: The base URL of the Collibra instance
+        asset_type_id: The ID of the asset type
+        assets: Assets of the current page
+        initial_nested_limit: Initial limit for nested fields
+        field_limits: Per-field limits the page was requested with, overriding initial_nested_limit
         
-        if len(current_assets) < limit:
-            logger.info(f"[Batch {batch_count}] Retrieved fewer assets than limit, ending pagination")
-            break
-            
-        paginate = current_assets[-1]['id']
-        batch_time = time.time() - batch_start_time
-        logger.info(f"\n[Batch {batch_count}] Completed batch in {batch_time:.2f}s")
-        logger.info(f"Total assets processed so far: {len(all_assets)}")
-
-    total_time = time.time() - start_time
-    logger.info("\n" + "="*60)
-    logger.info(f"[DONE] Completed processing {asset_type_name}")
-    logger.info(f"Total assets processed: {len(all_assets)}")
-    logger.info(f"Total batches processed: {batch_count}")
-    logger.info(f"Total time taken: {total_time:.2f} seconds")
-    avg_time = total_time/len(all_assets) if all_assets else 0
-    logger.info(f"Average time per asset: {avg_time:.2f} seconds")
-    logger.info("="*60)
+    Returns:
+        dict: Complete data keyed by (asset id, field); None if the fetch failed
+    """
+    field_limits = field_limits or {}
+    # Each (asset id, field) is fetched once per page even if the asset is listed
+    # twice; all occurrences read the same result
+    tasks = list(dict.fromkeys(
+        (asset['id'], field)
+        for asset in assets
+        for field in _NESTED_FIELDS_SET.intersection(asset)
+        if asset[field] is not None and len(asset[field]) > field_limits.get(field, initial_nested_limit)
+    ))
+    if not tasks:
+        return {}
     
-    return all_assets
+    # A single field gains nothing from an aliased document
+    if len(tasks) == 1:
+        asset_id, field = tasks[0]
+        return {tasks[0]: fetch_nested_data(base_url, asset_type_id, asset_id, field)}
+    
+    # Keep all fields of an asset in the same bulk query
+    tasks_by_asset = {}
+    for task in tasks:
+        tasks_by_asset.setdefault(task[0], []).append(task)
+    asset_tasks = list(tasks_by_asset.values())
+    chunks = [
+        [task for tasks_of_asset in asset_tasks[i:i + NESTED_BULK_ASSETS] for task in tasks_of_asset]
+        for i in range(0, len(asset_tasks), NESTED_BULK_ASSETS)
+    ]
+    
+    results = {}
+    executor = _get_nested_fetch_executor()
+    future_to_chunk = {
+        executor.submit(fetch_nested_data_bulk, base_url, asset_type_id, chunk): chunk
+        for chunk in chunks
+    }
+    
+    for future in as_completed(future_to_chunk):
+        try:
+            results.update(future.result())
+        except Exception as e:
+            chunk = future_to_chunk[future]
+            logger.error(f"Error fetching complete data for {len(chunk)} nested fields: {str(e)}")
+            results.update(dict.fromkeys(chunk))
+    
+    return results
 
-def process_data_streaming(base_url, asset_type_id, batch_size=10, limit=94, initial_nested_limit=50):
+def process_data(base_url, asset_type_id, limit=94, initial_nested_limit=INITIAL_NESTED_LIMIT, asset_type_name=None):
+    """
+    Process assets with optimized nested field handling, one asset at a time.
+    
+    This is process_data_streaming with page-sized batches, unpacked; use
+    list() on it only if every asset really has to be held in memory.
+    
+    Args:
+        base_url: The base URL of the Collibra instance
+        asset_type_id: The ID of the asset type to process
+        limit: Maximum number of assets to fetch per batch
+        initial_nested_limit: Initial limit for nested fields
+        asset_type_name: The name of the asset type, if already resolved by the caller
+        
+    Yields:
+        dict: Processed assets, page by page as each page completes
+    """
+    for asset_batch in process_data_streaming(
+        base_url,
+        asset_type_id,
+        batch_size=limit,
+        limit=limit,
+        initial_nested_limit=initial_nested_limit,
+        asset_type_name=asset_type_name
+    ):
+        yield from asset_batch
+
+def process_data_streaming(base_url, asset_type_id, batch_size=EXPORT_BATCH_SIZE, limit=94,
+                           initial_nested_limit=INITIAL_NESTED_LIMIT, asset_type_name=None):
     """
     Stream process assets with optimized memory usage by yielding batches.
     
@@ -152,11 +300,13 @@ def process_data_streaming(base_url, asset_type_id, batch_size=10, limit=94, ini
         batch_size: Number of assets to yield in each batch
         limit: Maximum number of assets to fetch per API call
         initial_nested_limit: Initial limit for nested fields
+        asset_type_name: The name of the asset type, if already resolved by the caller
         
     Yields:
         list: Batches of processed assets
     """
-    asset_type_name = get_asset_type_name(asset_type_id)
+    if asset_type_name is None:
+        asset_type_name = get_asset_type_name(asset_type_id)
     logger.info("="*60)
     logger.info(f"Starting streaming data processing for asset type: {asset_type_name} (ID: {asset_type_id})")
     logger.info(f"Configuration - API Batch Size: {limit}, Neo4j Batch Size: {batch_size}, Initial Nested Limit: {initial_nested_limit}")
@@ -166,99 +316,104 @@ def process_data_streaming(base_url, asset_type_id, batch_size=10, limit=94, ini
     api_batch_count = 0
     total_processed = 0
     current_batch = []
+    # Initial batches carry small nested limits, plus one probe item per field
+    probe_limit = initial_nested_limit + 1
+    # Fields that usually overflow get larger initial limits on later pages
+    field_sizes = {field: deque(maxlen=_NESTED_SIZE_SAMPLES) for field in _NESTED_FIELDS}
+    next_field_limits = {}
 
-    while True:
-        api_batch_count += 1
-        batch_start_time = time.time()
-        logger.info(f"\n[API Batch {api_batch_count}] Fetching new batch for {asset_type_name}")
-        
-        # Get initial batch with small nested limits
-        initial_response = fetch_data(
-            base_url,
-            asset_type_id, 
-            paginate, 
-            limit, 
-            0, 
-            initial_nested_limit
+    # Pages are fetched on a dedicated worker so the next page loads while
+    # the current one is processed and consumed
+    with ThreadPoolExecutor(max_workers=1) as page_executor:
+        next_page = page_executor.submit(
+            fetch_data, base_url, asset_type_id, paginate, limit, 0, probe_limit
         )
         
-        if not initial_response or 'data' not in initial_response or 'assets' not in initial_response['data']:
-            logger.error(f"[API Batch {api_batch_count}] Failed to fetch initial data")
-            break
+        while True:
+            api_batch_count += 1
+            batch_start_time = time.time()
+            logger.info(f"\n[API Batch {api_batch_count}] Fetching new batch for {asset_type_name}")
+            
+            # Get initial batch, prefetched while the previous page was processed
+            initial_response = next_page.result()
+            field_limits = next_field_limits
+            
+            if not initial_response or 'data' not in initial_response or 'assets' not in initial_response['data']:
+                logger.error(f"[API Batch {api_batch_count}] Failed to fetch initial data")
+                break
 
-        current_assets = initial_response['data']['assets']
-        if not current_assets:
-            logger.info(f"[API Batch {api_batch_count}] No more assets to fetch")
-            break
+            current_assets = initial_response['data']['assets']
+            if not current_assets:
+                logger.info(f"[API Batch {api_batch_count}] No more assets to fetch")
+                break
 
-        logger.info(f"[API Batch {api_batch_count}] Processing {len(current_assets)} assets")
+            logger.info(f"[API Batch {api_batch_count}] Processing {len(current_assets)} assets")
 
-        # Process each asset in the API batch
-        for asset_idx, asset in enumerate(current_assets, 1):
-            asset_id = asset['id']
-            asset_name = asset.get('displayName', 'Unknown Name')
-            logger.debug(f"[API Batch {api_batch_count}][Asset {asset_idx}] Processing: {asset_name}")
-            
-            complete_asset = asset.copy()
-            
-            # Define nested fields to check
-            nested_fields = [
-                'stringAttributes',
-                'multiValueAttributes', 
-                'numericAttributes',
-                'dateAttributes',
-                'booleanAttributes',
-                'outgoingRelations',
-                'incomingRelations',
-                'responsibilities'
-            ]
-
-            # Check each nested field
-            for field in nested_fields:
-                if field not in asset:
-                    continue
-                    
-                initial_data = asset[field]
+            # The next page only depends on the last asset id, so fetch it now
+            has_more_pages = len(current_assets) >= limit
+            if has_more_pages:
+                paginate = current_assets[-1]['id']
+                next_field_limits = _adaptive_field_limits(field_sizes, initial_nested_limit)
+                if next_field_limits != field_limits:
+                    logger.info(f"[API Batch {api_batch_count}] Initial nested limits raised for the next page: {next_field_limits}")
+                next_page = page_executor.submit(
+                    fetch_data, base_url, asset_type_id, paginate, limit, 0, probe_limit,
+                    {field: field_limit + 1 for field, field_limit in next_field_limits.items()}
+                )
+
+            # Fetch every truncated nested field of the page up front, concurrently
+            overflow_data = _fetch_overflow_fields(base_url, asset_type_id, current_assets, initial_nested_limit,
+                                                   field_limits)
+
+            # Process each asset in the API batch. Per-asset lines are DEBUG and
+            # only formatted when DEBUG is enabled
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            page_size = len(current_assets)
+            for asset_idx, asset in enumerate(current_assets, 1):
+                if debug_enabled:
+                    logger.debug("[API Batch %d][Asset %d/%d] Processing: %s",
+                                 api_batch_count, asset_idx, page_size, asset.get('displayName', 'Unknown Name'))
                 
-                # If we hit the initial limit, fetch all data
-                if len(initial_data) == initial_nested_limit:
-                    logger.debug(f"[API Batch {api_batch_count}][Asset {asset_idx}][{field}] Requires full fetch")
+                # Only fields that exceeded the initial limit are replaced. Page assets
+                # are shared with the response caches and concurrent callers, so an
+                # asset is copied (shallowly) instead of modified when a field changes
+                for field in _NESTED_FIELDS_SET.intersection(asset):
+                    initial_data = asset[field]
+                    if initial_data is None:
+                        continue
+                    if len(initial_data) <= field_limits.get(field, initial_nested_limit):
+                        field_sizes[field].append(len(initial_data))
+                        continue
                     
-                    complete_data = fetch_nested_data(
-                        base_url,
-                        asset_type_id,
-                        asset_id,
-                        field
-                    )
+                    # The probe item came back, so use the full fetch done for the page
+                    complete_data = overflow_data.get((asset['id'], field))
                     
                     if complete_data:
-                        complete_asset[field] = complete_data
-                        logger.debug(f"[API Batch {api_batch_count}][Asset {asset_idx}][{field}] "
-                                   f"Retrieved {len(complete_data)} items")
+                        asset = {**asset, field: complete_data}
+                        field_sizes[field].append(len(complete_data))
+                        if debug_enabled:
+                            logger.debug("[API Batch %d][Asset %d][%s] Retrieved %d items with a full fetch",
+                                         api_batch_count, asset_idx, field, len(complete_data))
                     else:
-                        logger.warning(f"[API Batch {api_batch_count}][Asset {asset_idx}][{field}] "
-                                     f"Failed to fetch complete data, using initial data")
-                        complete_asset[field] = initial_data
-                else:
-                    complete_asset[field] = initial_data
+                        logger.warning("[API Batch %d][Asset %d][%s] Failed to fetch complete data, using initial data",
+                                       api_batch_count, asset_idx, field)
 
-            current_batch.append(complete_asset)
-            total_processed += 1
-            
-            # Yield batch when it reaches the desired size
-            if len(current_batch) >= batch_size:
-                logger.info(f"Yielding batch of {len(current_batch)} assets (Total processed: {total_processed})")
-                yield current_batch
-                current_batch = []
-
-        # Check if we should continue pagination
-        if len(current_assets) < limit:
-            logger.info(f"[API Batch {api_batch_count}] Retrieved fewer assets than limit, ending pagination")
-            break
-            
-        paginate = current_assets[-1]['id']
-        batch_time = time.time() - batch_start_time
-        logger.info(f"[API Batch {api_batch_count}] Completed in {batch_time:.2f}s")
+                current_batch.append(asset)
+                total_processed += 1
+                
+                # Yield batch when it reaches the desired size
+                if len(current_batch) >= batch_size:
+                    logger.info("Yielding batch of %d assets (Total processed: %d)", len(current_batch), total_processed)
+                    yield current_batch
+                    current_batch = []
+
+            # Check if we should continue pagination
+            if not has_more_pages:
+                logger.info(f"[API Batch {api_batch_count}] Retrieved fewer assets than limit, ending pagination")
+                break
+                
+            batch_time = time.time() - batch_start_time
+            logger.info(f"[API Batch {api_batch_count}] Completed in {batch_time:.2f}s")
 
     # Yield any remaining assets in the final batch
     if current_batch:
@@ -267,14 +422,14 @@ def process_data_streaming(base_url, asset_type_id, batch_size=10, limit=94, ini
     
     logger.info(f"Streaming processing completed for {asset_type_name}. Total assets: {total_processed}")
 
-def process_asset_type(base_url, asset_type_id, batch_size=10):
+def process_asset_type(base_url, asset_type_id, batch_size=EXPORT_BATCH_SIZE):
     """
     Process a single asset type by ID and export to Neo4j with optimized batch processing.
     
     This function:
     1. Gets the asset type name
-    2. Processes assets in streaming batches to reduce memory usage
-    3. Flattens and exports assets in batches to Neo4j for better performance
+    2. Streams assets page by page from process_data to reduce memory usage
+    3. Flattens assets in batches and hands them to Neo4j writer threads
     
     Args:
         base_url: The base URL of the Collibra instance
@@ -292,32 +447,57 @@ def process_asset_type(base_url, asset_type_id, batch_size=10):
     failed_exports = 0
     total_processed = 0
 
-    # Use streaming processing instead of loading all assets into memory
-    for asset_batch in process_data_streaming(base_url, asset_type_id, batch_size):
-        if not asset_batch:
-            continue
+    # Flattened batches are handed to writer threads, so Neo4j writes overlap
+    # with each other and with fetching and flattening the next batch. The
+    # bounded queue keeps at most EXPORT_QUEUE_SIZE batches waiting in memory
+    export_queue = queue.Queue(maxsize=EXPORT_QUEUE_SIZE)
+    results_queue = queue.SimpleQueue()
+    writers = [
+        threading.Thread(
+            target=_export_worker,
+            args=(export_queue, results_queue, asset_type_name),
+            name=f"Neo4jWriter-{asset_type_id}-{i}",
+            daemon=True
+        )
+        for i in range(max(1, NEO4J_WRITER_THREADS))
+    ]
+    for writer in writers:
+        writer.start()
+
+    try:
+        asset_batch = []
+        for asset in process_data(base_url, asset_type_id, asset_type_name=asset_type_name):
+            total_processed += 1
+            asset_batch.append(asset)
             
-        logger.info(f"Processing batch of {len(asset_batch)} assets for {asset_type_name}")
-        
-        # Prepare flattened assets for batch export
-        flattened_batch = []
-        for asset in asset_batch:
-            try:
-                flattened_asset = flatten_json(asset, asset_type_name)
-                flattened_batch.append(flattened_asset)
-            except Exception as e:
-                failed_exports += 1
-                logger.error(f"Error flattening asset: {str(e)}")
+            if len(asset_batch) >= batch_size:
+                flattened_batch, failed_flattens = _flatten_batch(asset_batch, asset_type_name)
+                failed_exports += failed_flattens
+                # Drop the nested payloads before waiting for room in the queue
+                asset_batch = []
+                if flattened_batch:
+                    export_queue.put(flattened_batch)
+                logger.info(f"Total processed: {total_processed}")
         
-        # Batch export to Neo4j
-        if flattened_batch:
-            batch_success, batch_failed = export_batch_to_neo4j(flattened_batch, asset_type_name)
-            successful_exports += batch_success
-            failed_exports += batch_failed
-            total_processed += len(asset_batch)
-            
-            logger.info(f"Batch completed - Success: {batch_success}, Failed: {batch_failed}, "
-                       f"Total processed: {total_processed}")
+        # Export the remaining assets
+        if asset_batch:
+            flattened_batch, failed_flattens = _flatten_batch(asset_batch, asset_type_name)
+            failed_exports += failed_flattens
+            asset_batch = []
+            if flattened_batch:
+                export_queue.put(flattened_batch)
+    finally:
+        # Let the writers finish the queued batches even if fetching failed;
+        # each writer stops at its own None
+        for writer in writers:
+            export_queue.put(None)
+        for writer in writers:
+            writer.join()
+
+    while not results_queue.empty():
+        batch_success, batch_failed = results_queue.get()
+        successful_exports += batch_success
+        failed_exports += batch_failed
 
     end_time = time.time()
     elapsed_time = end_time - start_time
@@ -330,7 +510,37 @@ def process_asset_type(base_url, asset_type_id, batch_size=10):
         logger.critical(f"No assets found for asset type: {asset_type_name}")
         return 0, 0, 0
 
-def process_all_asset_types(base_url, asset_type_ids, max_workers=5):
+def _run_asset_types(base_url, asset_type_ids, max_workers):
+    """
+    Run process_asset_type for each asset type, concurrently when there are several.
+    
+    Args:
+        base_url: The base URL of the Collibra instance
+        asset_type_ids: A list of asset type IDs to process
+        max_workers: Maximum number of worker threads to use
+        
+    Yields:
+        tuple: (asset_type_id, get_result), in completion order; get_result()
+               returns the result of process_asset_type or raises its exception
+    """
+    # A single asset type gains nothing from a thread pool, so run it directly
+    if len(asset_type_ids) == 1:
+        yield asset_type_ids[0], partial(process_asset_type, base_url, asset_type_ids[0])
+        return
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(asset_type_ids)))) as executor:
+        future_to_asset = {
+            executor.submit(
+                process_asset_type, 
+                base_url, 
+                asset_type_id
+            ): asset_type_id for asset_type_id in asset_type_ids
+        }
+        
+        for future in as_completed(future_to_asset):
+            yield future_to_asset[future], future.result
+
+def process_all_asset_types(base_url, asset_type_ids, max_workers=ASSET_TYPE_WORKERS):
     """
     Process multiple asset types in parallel and export to Neo4j.
     
@@ -350,33 +560,23 @@ def process_all_asset_types(base_url, asset_type_ids, max_workers=5):
     total_failed_exports = 0
     processed_asset_types = 0
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_asset = {
-            executor.submit(
-                process_asset_type, 
-                base_url, 
-                asset_type_id
-            ): asset_type_id for asset_type_id in asset_type_ids
-        }
-        
-        for future in as_completed(future_to_asset):
-            asset_type_id = future_to_asset[future]
-            try:
-                elapsed_time, successful_exports, failed_exports = future.result()
-                total_successful_exports += successful_exports
-                total_failed_exports += failed_exports
+    for asset_type_id, get_result in _run_asset_types(base_url, asset_type_ids, max_workers):
+        try:
+            elapsed_time, successful_exports, failed_exports = get_result()
+            total_successful_exports += successful_exports
+            total_failed_exports += failed_exports
+            
+            if successful_exports > 0 or failed_exports > 0:
+                processed_asset_types += 1
+                logger.info(f"Asset type ID {asset_type_id}: "
+                          f"Time: {elapsed_time:.2f}s, "
+                          f"Exported: {successful_exports}, "
+                          f"Failed: {failed_exports}")
+            else:
+                logger.warning(f"No assets processed for asset type ID: {asset_type_id}")
                 
-                if successful_exports > 0 or failed_exports > 0:
-                    processed_asset_types += 1
-                    logger.info(f"Asset type ID {asset_type_id}: "
-                              f"Time: {elapsed_time:.2f}s, "
-                              f"Exported: {successful_exports}, "
-                              f"Failed: {failed_exports}")
-                else:
-                    logger.warning(f"No assets processed for asset type ID: {asset_type_id}")
-                    
-            except Exception as e:
-                logger.exception(f"Error processing asset type ID {asset_type_id}: {str(e)}")
+        except Exception as e:
+            logger.exception(f"Error processing asset type ID {asset_type_id}: {str(e)}")
     
     total_end_time = time.time()
     total_time = total_end_time - total_start_time
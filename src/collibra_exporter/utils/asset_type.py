@@ -8,20 +8,15 @@ import os
 import logging
 import requests
 from dotenv import load_dotenv
-from functools import lru_cache
 from ..api import get_auth_header
-from .http_session_pool import HTTPSessionPool
-from .cache_manager import cached
+from .cache_manager import cached, cache_manager
 from .http_optimizer import make_optimized_request
+from .json_codec import json_loads
 
 load_dotenv()
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Use session pool instead of creating individual sessions
-session_pool = HTTPSessionPool()
-
 @cached(cache_type="asset_type", ttl=3600, key_prefix="asset_type_name")
 def get_asset_type_name(asset_type_id):
     """
@@ -33,17 +28,32 @@ def get_asset_type_name(asset_type_id):
     Returns:
         str: The name of the asset type, or None if not found
     """
+    # Names rarely change, so reuse the one persisted by a previous run if there is one
+    persistent_key = f"asset_type_name:{asset_type_id}"
+    persistent_cache = cache_manager.get_persistent_cache()
+    if persistent_cache is not None:
+        persisted_name = persistent_cache.get(persistent_key)
+        if persisted_name is not None:
+            logger.debug(f"Persistent cache hit for asset type name: {asset_type_id}")
+            return persisted_name
+
     base_url = os.getenv('COLLIBRA_INSTANCE_URL')
     url = f"https://{base_url}/rest/2.0/assetTypes/{asset_type_id}"
 
     try:
-        # Use optimized HTTP request
+        # Auth headers are passed per request; the shared pooled session is never mutated
         headers = get_auth_header()
         response = make_optimized_request(url, method='GET', headers=headers)
-        json_response = response.json()
-        return json_response["name"]
+        json_response = json_loads(response.content)
+        asset_type_name = json_response["name"]
+        if persistent_cache is not None:
+            persistent_cache.put(persistent_key, asset_type_name)
+        return asset_type_name
     except requests.RequestException as e:
-        logging.error(f"Asset type not found in Collibra: {e}")
+        logger.error(f"Asset type not found in Collibra: {e}")
+        return None
+    except ValueError as e:
+        logger.error(f"Failed to parse asset type response: {e}")
         return None
 
 @cached(cache_type="metadata", ttl=7200, key_prefix="available_asset_types")
@@ -62,7 +72,7 @@ def get_available_asset_type():
         # Use optimized HTTP request
         headers = get_auth_header()
         response = make_optimized_request(url, method='GET', headers=headers)
-        original_results = response.json()["results"]
+        original_results = json_loads(response.content)["results"]
         modified_results = [{"id": asset["id"], "name": asset["name"]} for asset in original_results]
         
         logger.info(f"Successfully retrieved {len(modified_results)} asset types")
@@ -70,3 +80,6 @@ def get_available_asset_type():
     except requests.RequestException as e:
         logger.error(f"Failed to retrieve asset types: {e}")
         return None
+    except ValueError as e:
+        logger.error(f"Failed to parse asset types response: {e}")
+        return None
@@ -5,16 +5,20 @@ This module provides comprehensive caching functionality with multiple cache lay
 intelligent eviction policies, and performance optimization.
 """
 
+import os
 import time
 import json
 import hashlib
 import logging
 import threading
-from typing import Any, Dict, Optional, Tuple, List
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple, List
 from collections import OrderedDict
 from functools import wraps
 from dataclasses import dataclass, asdict
 from .performance_monitor import start_timer, stop_timer, increment_counter, record_metric
+from .persistent_cache import PersistentCache
+from .json_codec import json_loads, json_dumps, intern_values
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +31,7 @@ class CacheEntry:
     last_access: float = 0
     ttl: Optional[float] = None
     size_bytes: int = 0
+    compressed: bool = False
     
     def __post_init__(self):
         if self.last_access == 0:
@@ -40,7 +45,7 @@ class CacheEntry:
             if isinstance(self.value, (str, bytes)):
                 return len(self.value)
             elif isinstance(self.value, (list, dict)):
-                return len(json.dumps(self.value, default=str))
+                return len(json_dumps(self.value, default=str))
             else:
                 return len(str(self.value))
         except:
@@ -60,9 +65,16 @@ class CacheEntry:
 class LRUCache:
     """Thread-safe LRU cache with size and TTL management."""
     
-    def __init__(self, max_size: int = 1000, default_ttl: Optional[float] = None):
+    def __init__(self, max_size: int = 1000, default_ttl: Optional[float] = None,
+                 compress_threshold: Optional[int] = None,
+                 decompress_hook: Optional[Callable[[Any], Any]] = None):
         self.max_size = max_size
         self.default_ttl = default_ttl
+        # Lists/dicts whose JSON encoding exceeds this many bytes are stored zlib-compressed
+        self.compress_threshold = compress_threshold
+        # Applied to values decoded from compressed entries, which are new objects
+        # rather than the ones originally put
+        self.decompress_hook = decompress_hook
         self.cache = OrderedDict()
         self.lock = threading.RLock()
         self.total_size = 0
@@ -104,6 +116,19 @@ class LRUCache:
             entry = self.cache.pop(key)
             self.total_size -= entry.size_bytes
     
+    def _create_entry(self, value: Any, ttl: Optional[float]) -> CacheEntry:
+        """Create a cache entry, compressing large values if enabled."""
+        if self.compress_threshold is not None and isinstance(value, (list, dict)):
+            payload = json_dumps(value)
+            if len(payload) > self.compress_threshold:
+                compressed = zlib.compress(payload, 1)
+                increment_counter("cache_compressed_puts")
+                return CacheEntry(value=compressed, timestamp=time.time(), ttl=ttl,
+                                  size_bytes=len(compressed), compressed=True)
+            return CacheEntry(value=value, timestamp=time.time(), ttl=ttl, size_bytes=len(payload))
+        
+        return CacheEntry(value=value, timestamp=time.time(), ttl=ttl)
+    
     def get(self, key: str) -> Optional[Any]:
         """Get a value from the cache."""
         with self.lock:
@@ -125,27 +150,32 @@ class LRUCache:
             entry.access()
             increment_counter("cache_hits")
             
-            return entry.value
+            if not entry.compressed:
+                return entry.value
+            compressed_value = entry.value
+        
+        # Decompress outside the lock so other threads are not held up
+        value = json_loads(zlib.decompress(compressed_value))
+        if self.decompress_hook is not None:
+            value = self.decompress_hook(value)
+        return value
     
     def put(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
         """Put a value in the cache."""
+        # Use default TTL if not specified
+        if ttl is None:
+            ttl = self.default_ttl
+        
+        # Create cache entry outside the lock; encoding and compressing large
+        # values must not hold up other threads
+        entry = self._create_entry(value, ttl)
+        
+        # Check if entry would exceed memory limit
+        if entry.size_bytes > self.max_memory_mb * 1024 * 1024:
+            logger.warning(f"Cache entry too large ({entry.size_bytes} bytes), skipping")
+            return False
+        
         with self.lock:
-            # Use default TTL if not specified
-            if ttl is None:
-                ttl = self.default_ttl
-            
-            # Create cache entry
-            entry = CacheEntry(
-                value=value,
-                timestamp=time.time(),
-                ttl=ttl
-            )
-            
-            # Check if entry would exceed memory limit
-            if entry.size_bytes > self.max_memory_mb * 1024 * 1024:
-                logger.warning(f"Cache entry too large ({entry.size_bytes} bytes), skipping")
-                return False
-            
             # Remove existing entry if present
             if key in self.cache:
                 self._remove_entry(key)
@@ -201,9 +231,19 @@ class CacheManager:
             # Different cache layers for different types of data
             self.asset_type_cache = LRUCache(max_size=500, default_ttl=3600)  # 1 hour TTL
             self.graphql_response_cache = LRUCache(max_size=1000, default_ttl=300)  # 5 minutes TTL
-            self.nested_data_cache = LRUCache(max_size=2000, default_ttl=600)  # 10 minutes TTL
+            # Decompressed entries are re-interned so large payloads keep sharing name strings
+            self.nested_data_cache = LRUCache(max_size=2000, default_ttl=600,
+                                              compress_threshold=16 * 1024,
+                                              decompress_hook=intern_values)  # 10 minutes TTL, compress >16KB
             self.auth_cache = LRUCache(max_size=10, default_ttl=1800)  # 30 minutes TTL
             self.metadata_cache = LRUCache(max_size=100, default_ttl=7200)  # 2 hours TTL
+            # ETag validators and bodies kept past response expiry for conditional requests
+            self.etag_cache = LRUCache(max_size=1000, default_ttl=3600)  # 1 hour TTL
+            
+            # Disk-backed second tier, opened lazily once the environment is loaded
+            self.persistent_cache = None
+            self.persistent_cache_failed = False
+            self.persistent_cache_lock = threading.Lock()
             
             self.initialized = True
             logger.info("Cache manager initialized with multiple cache layers")
@@ -242,19 +282,70 @@ class CacheManager:
         """Get the metadata cache."""
         return self.metadata_cache
     
-    def clear_all_caches(self):
-        """Clear all cache layers."""
+    def get_etag_cache(self) -> LRUCache:
+        """Get the ETag validator cache."""
+        return self.etag_cache
+    
+    def get_persistent_cache(self) -> Optional[PersistentCache]:
+        """
+        Get the persistent cache shared across exporter runs.
+        
+        The cache is enabled with COLLIBRA_PERSISTENT_CACHE=true and stored in
+        COLLIBRA_CACHE_DIR (default ~/.collibra_exporter).
+        
+        Returns:
+            PersistentCache: The persistent cache, or None if it is disabled or unavailable
+        """
+        if self.persistent_cache is not None:
+            return self.persistent_cache
+        
+        if self.persistent_cache_failed or os.getenv('COLLIBRA_PERSISTENT_CACHE', 'false').lower() != 'true':
+            return None
+        
+        with self.persistent_cache_lock:
+            if self.persistent_cache is None:
+                cache_dir = os.path.expanduser(os.getenv('COLLIBRA_CACHE_DIR', '~/.collibra_exporter'))
+                ttl = float(os.getenv('COLLIBRA_PERSISTENT_CACHE_TTL', '86400'))  # 24 hours TTL
+                try:
+                    self.persistent_cache = PersistentCache(os.path.join(cache_dir, 'graphql.sqlite3'), default_ttl=ttl)
+                except Exception as e:
+                    logger.warning(f"Persistent cache unavailable, continuing without it: {e}")
+                    self.persistent_cache_failed = True
+                    return None
+        
+        return self.persistent_cache
+    
+    def close_persistent_cache(self):
+        """Close the persistent cache if it is open."""
+        with self.persistent_cache_lock:
+            if self.persistent_cache is not None:
+                self.persistent_cache.close()
+                self.persistent_cache = None
+    
+    def clear_all_caches(self, include_persistent: bool = False):
+        """
+        Clear all cache layers.
+        
+        Args:
+            include_persistent: Also clear the persistent cache on disk
+        """
         caches = [
             self.asset_type_cache,
             self.graphql_response_cache,
             self.nested_data_cache,
             self.auth_cache,
-            self.metadata_cache
+            self.metadata_cache,
+            self.etag_cache
         ]
         
         for cache in caches:
             cache.clear()
         
+        if include_persistent:
+            persistent_cache = self.get_persistent_cache()
+            if persistent_cache is not None:
+                persistent_cache.clear()
+        
         logger.info("All caches cleared")
     
     def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
@@ -264,7 +355,8 @@ class CacheManager:
             'graphql_response_cache': self.graphql_response_cache.stats(),
             'nested_data_cache': self.nested_data_cache.stats(),
             'auth_cache': self.auth_cache.stats(),
-            'metadata_cache': self.metadata_cache.stats()
+            'metadata_cache': self.metadata_cache.stats(),
+            'etag_cache': self.etag_cache.stats()
         }
     
     def log_cache_stats(self):
@@ -284,6 +376,19 @@ class CacheManager:
         
         logger.info("="*60)
 
+def make_cache_key(*parts) -> str:
+    """
+    Build a compact, fixed-size cache key from the given parts.
+    
+    Args:
+        *parts: Values identifying the cached item (converted with str())
+        
+    Returns:
+        16-character hex digest of the joined parts
+    """
+    key_bytes = b'\x1f'.join(str(part).encode() for part in parts)
+    return hashlib.blake2b(key_bytes, digest_size=8).hexdigest()
+
 def cached(cache_type: str = "graphql", ttl: Optional[float] = None, key_prefix: str = ""):
     """
     Decorator for caching function results.
@@ -345,9 +450,14 @@ def cached(cache_type: str = "graphql", ttl: Optional[float] = None, key_prefix:
 # Global cache manager instance
 cache_manager = CacheManager()
 
-def clear_all_caches():
-    """Clear all caches."""
-    cache_manager.clear_all_caches()
+def clear_all_caches(include_persistent: bool = False):
+    """
+    Clear all caches.
+    
+    Args:
+        include_persistent: Also clear the persistent cache on disk
+    """
+    cache_manager.clear_all_caches(include_persistent)
 
 def log_cache_stats():
     """Log cache statistics."""
@@ -7,8 +7,9 @@ This module provides centralized connection management and cleanup functionality
 import logging
 import atexit
 from .http_session_pool import HTTPSessionPool
-from ..models.exporter import Neo4jConnectionPool
+from ..models.exporter import get_connection_pool
 from .http_optimizer import cleanup_http_optimizer
+from .cache_manager import cache_manager
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +27,7 @@ class ConnectionManager:
     def __init__(self):
         if not self._initialized:
             self.http_pool = HTTPSessionPool()
-            self.neo4j_pool = Neo4jConnectionPool()
+            self.neo4j_pool = get_connection_pool()
             self._register_cleanup()
             ConnectionManager._initialized = True
             logger.info("Connection manager initialized")
@@ -57,6 +58,18 @@ class ConnectionManager:
         except Exception as e:
             logger.warning(f"Error cleaning up Neo4j connection pool: {e}")
         
+        try:
+            # Import locally to avoid circular dependencies
+            from ..api.oauth_auth import stop_token_refresh
+            stop_token_refresh()
+        except Exception as e:
+            logger.warning(f"Error stopping OAuth token refresh: {e}")
+        
+        try:
+            cache_manager.close_persistent_cache()
+        except Exception as e:
+            logger.warning(f"Error closing persistent cache: {e}")
+        
         logger.info("All connection pools cleaned up")
     
     def get_http_session(self, base_url: str = None):
@@ -7,19 +7,28 @@ adaptive retry strategies.
 """
 
 import time
-import json
 import logging
 import threading
-from typing import Dict, List, Any, Optional, Tuple, Callable
+from urllib.parse import urlsplit
+from typing import Dict, List, Any, Mapping, Optional, Tuple, Callable, Union
 from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
 from .performance_monitor import start_timer, stop_timer, increment_counter, record_metric
+from .json_codec import json_dumps
 
 logger = logging.getLogger(__name__)
 
+# (connect_timeout, read_timeout) applied when a caller does not pass one;
+# requests ignores timeouts set on the session object itself
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+# Worker threads shared by all concurrent request batches
+BATCH_EXECUTOR_WORKERS = 20
+
 @dataclass
 class RequestMetrics:
     """Metrics for HTTP request performance tracking."""
@@ -68,11 +77,11 @@ class BatchRequest:
     """Represents a batched HTTP request."""
     url: str
     method: str = 'POST'
-    headers: Dict[str, str] = field(default_factory=dict)
+    headers: Mapping[str, str] = field(default_factory=dict)
     data: Any = None
     json_data: Any = None
     params: Dict[str, str] = field(default_factory=dict)
-    timeout: Optional[float] = None
+    timeout: Optional[Union[float, Tuple[float, float]]] = None
     callback: Optional[Callable] = None
     request_id: str = field(default_factory=lambda: str(time.time()))
 
@@ -90,7 +99,7 @@ class AdaptiveRetryStrategy:
             # Base retry configuration
             base_config = {
                 'total': 3,
-                'backoff_factor': 1.0,
+                'backoff_factor': 0.3,
                 'status_forcelist': [429, 500, 502, 503, 504],
                 'allowed_methods': ["HEAD", "GET", "POST", "PUT", "DELETE", "OPTIONS", "TRACE"]
             }
@@ -106,7 +115,6 @@ class AdaptiveRetryStrategy:
                     base_config['backoff_factor'] = 2.0
                 elif error_rate < 0.2:  # Low error rate
                     base_config['total'] = 2
-                    base_config['backoff_factor'] = 0.5
             
             # Adjust based on recent error history
             if error_history:
@@ -206,7 +214,8 @@ class HTTPOptimizer:
             self.metrics = RequestMetrics()
             self.metrics_lock = threading.Lock()
             self.retry_strategy = AdaptiveRetryStrategy()
-            self.batch_executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="HTTPBatch")
+            self.batch_executor = None
+            self.batch_executor_lock = threading.Lock()
             self.request_queue = []
             self.queue_lock = threading.Lock()
             self.initialized = True
@@ -220,7 +229,7 @@ class HTTPOptimizer:
         retry_config = self.retry_strategy.get_retry_config(base_url, [])
         adapter = OptimizedHTTPAdapter(
             pool_connections=20,    # Increased connection pools
-            pool_maxsize=50,        # Increased max connections per pool
+            pool_maxsize=100,       # Increased max connections per pool
             max_retries=retry_config,
             pool_block=False
         )
@@ -230,13 +239,12 @@ class HTTPOptimizer:
         session.mount("https://", adapter)
         
         # Configure session defaults
-        session.timeout = (10, 30)  # (connect_timeout, read_timeout)
         session.headers.update({
             'Connection': 'keep-alive',
             'Keep-Alive': 'timeout=30, max=100',
             'Content-Type': 'application/json',
             'Accept': 'application/json',
-            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Encoding': ACCEPT_ENCODING,  # gzip/deflate, plus br when brotli is installed
             'User-Agent': 'Collibra-Bulk-Exporter/2.0 (Optimized)'
         })
         
@@ -247,6 +255,12 @@ class HTTPOptimizer:
     
     def get_optimized_session(self, base_url: str) -> requests.Session:
         """Get or create an optimized session for the given base URL."""
+        # Sessions are never replaced once created, so the common case needs no lock
+        session = self.sessions.get(base_url)
+        if session is not None:
+            increment_counter("http_optimized_sessions_reused")
+            return session
+        
         with self.session_lock:
             if base_url not in self.sessions:
                 logger.info(f"Creating optimized HTTP session for {base_url}")
@@ -259,19 +273,26 @@ class HTTPOptimizer:
             return self.sessions[base_url]
     
     def make_optimized_request(self, url: str, method: str = 'POST', 
-                             headers: Optional[Dict[str, str]] = None,
+                             headers: Optional[Mapping[str, str]] = None,
                              **kwargs) -> requests.Response:
         """Make an optimized HTTP request with advanced error handling."""
-        from urllib.parse import urlparse
-        parsed_url = urlparse(url)
+        parsed_url = urlsplit(url)
         base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
         
         session = self.get_optimized_session(base_url)
         
-        # Merge headers
-        request_headers = session.headers.copy()
-        if headers:
-            request_headers.update(headers)
+        # Static headers live on the session and are merged by requests itself,
+        # so only the per-call headers (e.g. Authorization) are passed here
+        request_headers = headers or None
+        
+        # Bound every request so a stalled connection cannot park a worker
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = DEFAULT_TIMEOUT
+        
+        # Serialize JSON bodies with the fast codec instead of requests' json.dumps
+        json_body = kwargs.pop('json', None)
+        if json_body is not None and not kwargs.get('data'):
+            kwargs['data'] = json_dumps(json_body)
         
         # Track request metrics
         timer_id = start_timer(f"http_optimized_request_{method.lower()}")
@@ -326,8 +347,16 @@ class HTTPOptimizer:
         finally:
             stop_timer(timer_id)
     
+    def _get_batch_executor(self) -> ThreadPoolExecutor:
+        """Get the long-lived executor shared by all request batches."""
+        with self.batch_executor_lock:
+            if self.batch_executor is None:
+                self.batch_executor = ThreadPoolExecutor(max_workers=BATCH_EXECUTOR_WORKERS,
+                                                         thread_name_prefix="HTTPBatch")
+            return self.batch_executor
+    
     def batch_requests(self, requests_list: List[BatchRequest], 
-                      max_concurrent: int = 5) -> List[Tuple[str, requests.Response, Exception]]:
+                      max_concurrent: int = 10) -> List[Tuple[str, requests.Response, Exception]]:
         """Execute multiple requests concurrently with optimized connection reuse."""
         if not requests_list:
             return []
@@ -360,15 +389,20 @@ class HTTPOptimizer:
                 logger.error(f"Batch request {batch_req.request_id} failed: {e}")
                 return (batch_req.request_id, None, e)
         
-        # Execute requests concurrently
-        with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
-            future_to_request = {
-                executor.submit(execute_request, req): req for req in requests_list
-            }
-            
-            for future in as_completed(future_to_request):
-                request_id, response, error = future.result()
-                results.append((request_id, response, error))
+        # Execute requests on the shared executor, keeping at most
+        # max_concurrent of this batch in flight at once
+        executor = self._get_batch_executor()
+        in_flight = threading.BoundedSemaphore(max_concurrent)
+        futures = []
+        for req in requests_list:
+            in_flight.acquire()
+            future = executor.submit(execute_request, req)
+            future.add_done_callback(lambda _: in_flight.release())
+            futures.append(future)
+        
+        for future in as_completed(futures):
+            request_id, response, error = future.result()
+            results.append((request_id, response, error))
         
         stop_timer(timer_id)
         increment_counter("http_batch_requests_completed")
@@ -425,18 +459,25 @@ class HTTPOptimizer:
             self.sessions.clear()
         
         # Shutdown batch executor
-        self.batch_executor.shutdown(wait=True)
+        with self.batch_executor_lock:
+            if self.batch_executor is not None:
+                self.batch_executor.shutdown(wait=True)
+                self.batch_executor = None
         logger.info("HTTP Optimizer cleanup completed")
 
 # Global HTTP optimizer instance
 http_optimizer = HTTPOptimizer()
 
+def get_optimized_session(base_url: str) -> requests.Session:
+    """Get the shared, connection-pooled session for the given base URL."""
+    return http_optimizer.get_optimized_session(base_url)
+
 def make_optimized_request(url: str, method: str = 'POST', 
-                         headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+                         headers: Optional[Mapping[str, str]] = None, **kwargs) -> requests.Response:
     """Make an optimized HTTP request using the global optimizer."""
     return http_optimizer.make_optimized_request(url, method, headers, **kwargs)
 
-def batch_http_requests(requests_list: List[BatchRequest], max_concurrent: int = 5) -> List[Tuple[str, requests.Response, Exception]]:
+def batch_http_requests(requests_list: List[BatchRequest], max_concurrent: int = 10) -> List[Tuple[str, requests.Response, Exception]]:
     """Execute multiple HTTP requests concurrently."""
     return http_optimizer.batch_requests(requests_list, max_concurrent)
 
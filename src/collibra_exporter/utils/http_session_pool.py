@@ -9,6 +9,7 @@ import threading
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
 from .performance_monitor import increment_counter
 
 logger = logging.getLogger(__name__)
@@ -54,7 +55,7 @@ class HTTPSessionPool:
                 # Configure retry strategy
                 retry_strategy = Retry(
                     total=3,
-                    backoff_factor=1,
+                    backoff_factor=0.3,
                     status_forcelist=[429, 500, 502, 503, 504],
                     allowed_methods=["HEAD", "GET", "POST", "PUT", "DELETE", "OPTIONS", "TRACE"]
                 )
@@ -62,8 +63,8 @@ class HTTPSessionPool:
                 # Configure HTTP adapter with connection pooling
                 adapter = HTTPAdapter(
                     max_retries=retry_strategy,
-                    pool_connections=10,  # Number of connection pools
-                    pool_maxsize=20,      # Maximum number of connections per pool
+                    pool_connections=16,  # Number of connection pools
+                    pool_maxsize=64,      # Maximum number of connections per pool
                     pool_block=False      # Don't block when pool is full
                 )
                 
@@ -76,6 +77,7 @@ class HTTPSessionPool:
                 session.headers.update({
                     'Content-Type': 'application/json',
                     'Accept': 'application/json',
+                    'Accept-Encoding': ACCEPT_ENCODING,
                     'User-Agent': 'Collibra-Bulk-Exporter/1.0'
                 })
                 
@@ -0,0 +1,77 @@
+"""
+JSON Codec Module
+
+This module provides fast JSON encoding and decoding, using orjson when it is
+installed and falling back to the standard library otherwise.
+"""
+
+import sys
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Keys of Collibra nested items whose string values repeat across rows (type, role and corole names)
+INTERNED_VALUE_KEYS = frozenset(('name', 'role', 'corole'))
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON document.
+
+    Args:
+        data: Raw JSON bytes (e.g. response.content) or string
+
+    Returns:
+        The decoded Python object
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Encode an object as a compact UTF-8 JSON document.
+
+    Args:
+        obj: The object to encode
+        default: Optional fallback converting values that are not JSON serializable
+
+    Returns:
+        bytes: The encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default)
+    return json.dumps(obj, separators=(',', ':'), default=default).encode('utf-8')
+
+def intern_values(obj: Any) -> Any:
+    """
+    Intern repeated categorical string values in decoded nested items, in place.
+    
+    Decoders already share dict keys, but values such as type and role names
+    are allocated afresh for every row; interning them lets all rows share
+    one string per distinct name.
+    
+    Args:
+        obj: Decoded JSON list or dict
+        
+    Returns:
+        The same object
+    """
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if isinstance(value, str):
+                if key in INTERNED_VALUE_KEYS:
+                    obj[key] = sys.intern(value)
+            elif isinstance(value, (dict, list)):
+                intern_values(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            if isinstance(item, (dict, list)):
+                intern_values(item)
+    return obj
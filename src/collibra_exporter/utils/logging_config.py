@@ -6,8 +6,13 @@ This module provides functionality for configuring logging.
 
 import os
 import time
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+from queue import SimpleQueue
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+# Writes queued log records to the real handlers on a background thread
+_queue_listener = None
 
 def setup_logging(log_dir='logs', max_days=30):
     """
@@ -20,6 +25,8 @@ def setup_logging(log_dir='logs', max_days=30):
     Returns:
         logging.Logger: Configured logger instance
     """
+    global _queue_listener
+    
     # Create logs directory if it doesn't exist
     os.makedirs(log_dir, exist_ok=True)
     
@@ -56,10 +63,17 @@ def setup_logging(log_dir='logs', max_days=30):
     
     # Remove any existing handlers
     logger.handlers = []
+    if _queue_listener is not None:
+        _queue_listener.stop()
+    else:
+        atexit.register(stop_logging)
     
-    # Add our handlers
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # Logging threads only enqueue records; formatting and file/console I/O
+    # happen on the listener thread
+    log_queue = SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    _queue_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _queue_listener.start()
 
     # Log the start of a new session
     logger.info("="*60)
@@ -72,6 +86,13 @@ def setup_logging(log_dir='logs', max_days=30):
 
     return logger
 
+def stop_logging():
+    """Flush queued log records and stop the background log writer."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
 def cleanup_old_logs(log_dir, max_days, logger):
     """
     Remove log files older than max_days.
@@ -0,0 +1,102 @@
+"""
+Persistent Cache Module
+
+This module provides a disk-backed cache, stored in SQLite, that keeps
+GraphQL responses between exporter runs.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Optional
+from .json_codec import json_loads, json_dumps
+from .performance_monitor import increment_counter
+
+logger = logging.getLogger(__name__)
+
+class PersistentCache:
+    """Thread-safe key/value cache persisted to a SQLite database."""
+
+    def __init__(self, path: str, default_ttl: Optional[float] = None):
+        self.path = path
+        self.default_ttl = default_ttl
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+        self.connection.commit()
+
+        # Drop entries that expired since the previous run
+        self.purge_expired()
+        logger.info(f"Persistent cache opened at {path}")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value from the cache, or None if missing or expired."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            increment_counter("persistent_cache_misses")
+            return None
+
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            increment_counter("persistent_cache_misses")
+            return None
+
+        increment_counter("persistent_cache_hits")
+        return json_loads(value)
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Put a value in the cache."""
+        if ttl is None:
+            ttl = self.default_ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+
+        try:
+            payload = json_dumps(value)
+            with self.lock:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, payload, expires_at)
+                )
+                self.connection.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Failed to write persistent cache entry: {e}")
+            return False
+
+        increment_counter("persistent_cache_puts")
+        return True
+
+    def purge_expired(self):
+        """Remove all expired entries."""
+        with self.lock:
+            self.connection.execute(
+                "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+            )
+            self.connection.commit()
+
+    def clear(self):
+        """Clear all cache entries."""
+        with self.lock:
+            self.connection.execute("DELETE FROM cache")
+            self.connection.commit()
+        increment_counter("persistent_cache_clears")
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self.lock:
+            self.connection.close()